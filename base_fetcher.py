@@ -4,14 +4,23 @@ base_fetcher.py
 Clase base abstracta para todos los fetchers de datos financieros.
 """
 
+import yfinance as yf
+
 
 class BaseDataFetcher:
 
-    def __init__(self, ticker: str):
+    def __init__(self, ticker: str, yf_ticker=None):
         self.ticker       = ticker.upper().strip()
         self.company_name = ""
         self.sic_code     = -1
 
+        # yf_ticker permite compartir un mismo yf.Ticker (y sus cachés internas)
+        # entre los fetchers de un análisis. No se le pasa session: yfinance
+        # guarda una sola sesión para todo el proceso y pasarle otra la reemplaza
+        if yf_ticker is None:
+            yf_ticker = yf.Ticker(self.ticker)
+        self._stock       = yf_ticker
+
     def fetch_all(self) -> dict:
         raise NotImplementedError("Las subclases deben implementar fetch_all().")
 
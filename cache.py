@@ -0,0 +1,125 @@
+"""
+cache.py
+--------
+Caché persistente en disco para respuestas de yfinance.
+
+Cada entrada se guarda como JSON en .cache/{ticker}/{md5(ticker:endpoint)}.json
+con la forma {"ts": epoch, "payload": ...}; {ticker} se sanea para que no
+pueda salir de .cache ni crear subcarpetas. Una entrada expira cuando su
+antigüedad supera el TTL indicado en get(). Las entradas leídas o escritas
+se guardan además en memoria (hasta MEMORY_MAX_ENTRIES, descartando las más
+antiguas), así que repetir un get() en el mismo proceso no vuelve a tocar
+el disco.
+
+La caché es opcional: un archivo ilegible o con otra forma cuenta como miss
+y un payload que no se puede serializar simplemente no se guarda.
+
+TTL por defecto configurable con la variable de entorno STOCK_CACHE_TTL_DAYS.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+
+def _ttl_days_from_env(default: float = 1.0) -> float:
+    """STOCK_CACHE_TTL_DAYS, o default si no está definida o no es un número."""
+    try:
+        return float(os.environ.get("STOCK_CACHE_TTL_DAYS", default))
+    except ValueError:
+        return default
+
+
+DEFAULT_TTL_DAYS = _ttl_days_from_env()
+DEFAULT_TTL      = DEFAULT_TTL_DAYS * 24 * 3600
+TNX_TTL          = 10 * 60
+
+MEMORY_MAX_ENTRIES = 512
+
+# Caracteres fuera de los usados en tickers ("BRK-B", "SAN.MC", "^TNX",
+# "EURUSD=X") y un punto inicial, para que ".." o "A/B" no escapen de root
+_UNSAFE_DIR_CHARS = re.compile(r"[^A-Za-z0-9^=.-]|^\.")
+
+
+class FileCache:
+
+    def __init__(self, root: str = ".cache", enabled: bool = True,
+                 max_memory: int = MEMORY_MAX_ENTRIES):
+        self.root       = root
+        self.enabled    = enabled
+        self.max_memory = max_memory
+        self._memory    = {}
+        # Los fetchers corren en hilos: solo _memory va bajo el lock, el disco no
+        self._lock      = threading.Lock()
+
+    def get(self, key: tuple, ttl: float = DEFAULT_TTL):
+        """Retorna el payload guardado, o None si no existe o expiró."""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        with self._lock:
+            entry = self._memory.get(path)
+        if entry is None:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                return None
+            # JSON válido pero sin la forma {"ts": número, ...}: también es un miss
+            if not isinstance(entry, dict) or not isinstance(entry.get("ts"), (int, float)):
+                return None
+            self._remember(path, entry)
+        if time.time() - entry.get("ts", 0) > ttl:
+            with self._lock:
+                # Solo si nadie la reemplazó entre tanto por una más nueva
+                if self._memory.get(path) is entry:
+                    del self._memory[path]
+            return None
+        return entry.get("payload")
+
+    def set(self, key: tuple, value) -> None:
+        if not self.enabled:
+            return
+        try:
+            text = json.dumps({"ts": time.time(), "payload": value}, default=str)
+        except (TypeError, ValueError):
+            # La caché es opcional: lo que no se puede serializar no se guarda
+            return
+        path = self._path(key)
+        tmp  = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        # En memoria va lo mismo que en disco (default=str ya convirtió valores),
+        # así un hit del mismo proceso retorna los mismos tipos que uno del disco
+        self._remember(path, json.loads(text))
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp, path)
+        except OSError:
+            # Un fallo de escritura no debe romper el análisis ni dejar el .tmp
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def _remember(self, path: str, entry: dict) -> None:
+        # dict conserva el orden de inserción: la primera clave es la más antigua
+        with self._lock:
+            self._memory.pop(path, None)
+            while len(self._memory) >= self.max_memory:
+                self._memory.pop(next(iter(self._memory)), None)
+            self._memory[path] = entry
+
+    def _path(self, key: tuple) -> str:
+        ticker, endpoint = key
+        digest = hashlib.md5(f"{ticker}:{endpoint}".encode("utf-8")).hexdigest()
+        # El nombre del archivo ya distingue tickers que sanean igual
+        folder = _UNSAFE_DIR_CHARS.sub("_", str(ticker)) or "_"
+        return os.path.join(self.root, folder, f"{digest}.json")
+
+
+# Instancia compartida por los fetchers (main.py la desactiva con --no-cache)
+CACHE = FileCache()
@@ -5,7 +5,54 @@ BaseCalculator, ZScoreCalculator y MertonCalculator.
 Toda la aritmética de los modelos vive aquí.
 """
 
-from math import log, sqrt, erf
+import math
+from math import erf
+
+import numpy as np
+
+_SQRT2     = math.sqrt(2.0)
+_INV_SQRT2 = 1.0 / _SQRT2
+
+# Numba es opcional: si no está instalado, el kernel corre en Python puro.
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+# SciPy es opcional: ndtr es la CDF normal vectorizada en C. Sin SciPy se
+# aplica math.erf elemento a elemento (mismo resultado, más lento).
+_erf_vec = np.vectorize(erf, otypes=[np.float64])
+
+
+def _ndtr_erf(x):
+    """CDF normal estándar con math.erf; acepta escalares y arreglos."""
+    x = np.asarray(x, dtype=np.float64)
+    return 0.5 * (1.0 + _erf_vec(x * _INV_SQRT2))
+
+
+try:
+    from scipy.special import ndtr
+except ImportError:
+    ndtr = _ndtr_erf
+
+
+# Coeficientes del Z-Score como vectores (x1..x5), para producto punto con NumPy
+_COEFFS = {
+    "Z":              np.array([1.2,  1.4,  3.3,  0.6,  1.0], dtype=np.float64),
+    "Z_double_prime": np.array([6.56, 3.26, 6.72, 1.05, 0.0], dtype=np.float64),
+}
+
+
+@njit(cache=True, fastmath=True)
+def _merton_core(V_A, D, mu, sigma, T):
+    """Núcleo numérico de Merton: (V_A, D, μ, σ, T) -> (DD, PD)."""
+    sqrt_T = math.sqrt(T)
+    dd = (math.log(V_A / D) + (mu - sigma * sigma * 0.5) * T) / (sigma * sqrt_T)
+    pd = 1.0 - 0.5 * (1.0 + math.erf(dd * _INV_SQRT2))
+    return dd, pd
 
 
 class BaseCalculator:
@@ -44,13 +91,10 @@ class ZScoreCalculator(BaseCalculator):
     X5 = Sales / Total Assets  (solo en Z)
     """
 
+    # Vista dict de _COEFFS, se mantiene por compatibilidad
     COEFFICIENTS = {
-        "Z": {
-            "x1": 1.2, "x2": 1.4, "x3": 3.3, "x4": 0.6, "x5": 1.0
-        },
-        "Z_double_prime": {
-            "x1": 6.56, "x2": 3.26, "x3": 6.72, "x4": 1.05, "x5": 0.0
-        },
+        v: dict(zip(("x1", "x2", "x3", "x4", "x5"), vec.tolist()))
+        for v, vec in _COEFFS.items()
     }
 
     def __init__(self, data: dict, model_version: str):
@@ -59,6 +103,7 @@ class ZScoreCalculator(BaseCalculator):
             raise ValueError(f"Versión inválida: '{model_version}'.")
         self.model_version = model_version
         self.coefficients  = self.COEFFICIENTS[model_version]
+        self._coef_vec     = _COEFFS[model_version]
         self.x1 = self.x2 = self.x3 = self.x4 = self.x5 = 0.0
         self.z_score = 0.0
 
@@ -77,26 +122,73 @@ class ZScoreCalculator(BaseCalculator):
         self.x4 = self.data["market_cap"]        / tl
         self.x5 = self.data["sales"] / ta if self.model_version == "Z" else 0.0
 
-        c = self.coefficients
-        self.z_score = (
-            c["x1"] * self.x1 +
-            c["x2"] * self.x2 +
-            c["x3"] * self.x3 +
-            c["x4"] * self.x4 +
-            c["x5"] * self.x5
-        )
+        xs = np.array([self.x1, self.x2, self.x3, self.x4, self.x5], dtype=np.float64)
+        self.z_score = float(self._coef_vec @ xs)
 
         self.result = {
             "model_version": self.model_version,
-            "x1": round(self.x1, 4),
-            "x2": round(self.x2, 4),
-            "x3": round(self.x3, 4),
-            "x4": round(self.x4, 4),
-            "x5": round(self.x5, 4),
-            "z_score": round(self.z_score, 4),
+            "x1": self.x1,
+            "x2": self.x2,
+            "x3": self.x3,
+            "x4": self.x4,
+            "x5": self.x5,
+            "z_score": self.z_score,
         }
         return self.result
 
+    @classmethod
+    def calculate_batch(cls, data_list: list, model_versions: list) -> list:
+        """
+        Z-Score vectorizado para N empresas a la vez.
+        Cada campo se guarda como arreglo (N,), los ratios forman una matriz
+        X (N,5) y los coeficientes de cada fila una matriz C (N,5):
+            z = Σ X·C  por fila
+        Retorna una lista de dicts con la misma forma que calculate().
+        """
+        n = len(data_list)
+        if n != len(model_versions):
+            raise ValueError("data_list y model_versions deben tener el mismo largo.")
+        if n == 0:
+            return []
+        for v in model_versions:
+            if v not in cls.COEFFICIENTS:
+                raise ValueError(f"Versión inválida: '{v}'.")
+
+        def column(field):
+            return np.fromiter((d[field] for d in data_list), dtype=np.float64, count=n)
+
+        ta = column("total_assets")
+        tl = column("total_liabilities")
+        if np.any(ta == 0):
+            raise ZeroDivisionError("Total Assets es 0.")
+        if np.any(tl == 0):
+            raise ZeroDivisionError("Total Liabilities es 0.")
+
+        is_z = np.fromiter((v == "Z" for v in model_versions), dtype=bool, count=n)
+        X = np.stack([
+            column("working_capital")   / ta,
+            column("retained_earnings") / ta,
+            column("ebit")              / ta,
+            column("market_cap")        / tl,
+            np.where(is_z, column("sales") / ta, 0.0),
+        ], axis=1)
+
+        C = np.stack([_COEFFS[v] for v in model_versions])
+        z = (X * C).sum(axis=1)
+
+        return [
+            {
+                "model_version": v,
+                "x1": float(X[i, 0]),
+                "x2": float(X[i, 1]),
+                "x3": float(X[i, 2]),
+                "x4": float(X[i, 3]),
+                "x5": float(X[i, 4]),
+                "z_score": float(z[i]),
+            }
+            for i, v in enumerate(model_versions)
+        ]
+
 
 # ══════════════════════════════════════════════════════════════════════
 # Merton Calculator
@@ -135,22 +227,49 @@ class MertonCalculator(BaseCalculator):
         if sigma <= 0:
             raise ValueError("σ debe ser mayor que 0.")
 
-        self.DD = (log(V_A / D) + (mu - (sigma ** 2) / 2) * T) / (sigma * sqrt(T))
-        self.PD = 1.0 - self._normal_cdf(self.DD)
+        self.DD, self.PD = _merton_core(V_A, D, mu, sigma, T)
 
+        # Valores sin redondear: el redondeo es solo de presentación (ReportGenerator)
         self.result = {
-            "V_A":    round(V_A, 2),
-            "D":      round(D, 2),
-            "mu":     round(mu, 4),
-            "sigma":  round(sigma, 4),
+            "V_A":    V_A,
+            "D":      D,
+            "mu":     mu,
+            "sigma":  sigma,
             "T":      T,
-            "DD":     round(self.DD, 4),
-            "PD":     round(self.PD, 6),
-            "PD_pct": round(self.PD * 100, 4),
+            "DD":     self.DD,
+            "PD":     self.PD,
+            "PD_pct": self.PD * 100,
         }
         return self.result
 
+    @classmethod
+    def calculate_batch(cls, V_A_arr, D_arr, mu_arr, sigma_arr, T: float = 1.0) -> tuple:
+        """
+        DD y PD vectorizados para N empresas.
+        Recibe arreglos (N,) y retorna (DD, PD) como arreglos (N,).
+        """
+        V_A_arr   = np.asarray(V_A_arr,   dtype=np.float64)
+        D_arr     = np.asarray(D_arr,     dtype=np.float64)
+        mu_arr    = np.asarray(mu_arr,    dtype=np.float64)
+        sigma_arr = np.asarray(sigma_arr, dtype=np.float64)
+
+        if np.any(D_arr <= 0):
+            raise ValueError("D (pasivos) debe ser mayor que 0.")
+        if np.any(V_A_arr <= 0):
+            raise ValueError("V_A (activos) debe ser mayor que 0.")
+        if np.any(sigma_arr <= 0):
+            raise ValueError("σ debe ser mayor que 0.")
+
+        dd  = (np.log(V_A_arr / D_arr) + (mu_arr - 0.5 * sigma_arr * sigma_arr) * T) / (sigma_arr * np.sqrt(T))
+        pd_ = 1.0 - cls._normal_cdf_vec(dd)
+        return dd, pd_
+
     @staticmethod
     def _normal_cdf(x: float) -> float:
         """CDF normal estándar usando erf de math (sin scipy)."""
-        return (1.0 + erf(x / sqrt(2.0))) / 2.0
\ No newline at end of file
+        return 0.5 * (1.0 + erf(x * _INV_SQRT2))
+
+    @staticmethod
+    def _normal_cdf_vec(x):
+        """CDF normal estándar sobre arreglos (scipy.special.ndtr si está disponible)."""
+        return ndtr(x)
\ No newline at end of file
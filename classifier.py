@@ -10,9 +10,47 @@ Versiones del Z-Score según Altman:
   Z'  — Empresas privadas              (no aplica, todos los tickers son públicos)
 """
 
+import logging
+import re
+import sys
+
+# pyahocorasick es opcional: sin él se usan las regex compiladas
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+log = logging.getLogger(__name__)
+
+
+def _build_automaton(manufacturing: list, financial: list):
+    """Autómata Aho-Corasick con ambas listas; cada match retorna (grupo, keyword)."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for kw in manufacturing:
+        automaton.add_word(kw, ("mfg", kw))
+    for kw in financial:
+        automaton.add_word(kw, ("fin", kw))
+    automaton.make_automaton()
+    return automaton
+
+
+# Resultados de classify() internados una sola vez
+_MFG = sys.intern("manufacturing")
+_NON = sys.intern("non_manufacturing")
+_FIN = sys.intern("financial")
+_Z   = sys.intern("Z")
+_ZPP = sys.intern("Z_double_prime")
+
 
 class CompanyClassifier:
 
+    __slots__ = (
+        "industry", "total_liabilities", "company_type", "model_version",
+        "_scanned", "_has_mfg", "_has_fin",
+    )
+
     # Keywords que identifican industrias manufactureras
     MANUFACTURING_KEYWORDS = [
         "manufactur", "auto", "aerospace", "defense", "steel", "chemical",
@@ -28,33 +66,44 @@ class CompanyClassifier:
         "credit", "mortgage", "reit", "fund", "brokerage", "capital markets",
     ]
 
+    # Una sola alternación compilada por lista: un escaneo en C por llamada
+    _MFG_RE = re.compile("|".join(re.escape(kw) for kw in MANUFACTURING_KEYWORDS))
+    _FIN_RE = re.compile("|".join(re.escape(kw) for kw in FINANCIAL_KEYWORDS))
+
+    # Ambas listas en un solo autómata: una pasada O(len(industry)) por empresa
+    _AUTOMATON = _build_automaton(MANUFACTURING_KEYWORDS, FINANCIAL_KEYWORDS)
+
     def __init__(self, industry: str, total_liabilities: float = 0.0):
         self.industry          = (industry or "").lower()
         self.total_liabilities = total_liabilities
         self.company_type      = ""
         self.model_version     = ""
+        self._scanned          = False
+        self._has_mfg          = False
+        self._has_fin          = False
 
     def classify(self) -> str:
         if not self.industry:
-            print("  [INFO] Industry no disponible. Usando Z'' por defecto.")
-            self.company_type  = "non_manufacturing"
-            self.model_version = "Z_double_prime"
+            log.info("  [INFO] Industry no disponible. Usando Z'' por defecto.")
+            self.company_type  = _NON
+            self.model_version = _ZPP
 
         elif self._is_financial():
-            self.company_type  = "financial"
-            self.model_version = "Z_double_prime"
-            print(
-                f"  [AVISO] Sector financiero ('{self.industry}'). "
-                f"Z-Score tiene interpretabilidad limitada. Se usará Z''."
+            self.company_type  = _FIN
+            self.model_version = _ZPP
+            log.warning(
+                "  [AVISO] Sector financiero ('%s'). "
+                "Z-Score tiene interpretabilidad limitada. Se usará Z''.",
+                self.industry,
             )
 
         elif self._is_manufacturing():
-            self.company_type  = "manufacturing"
-            self.model_version = "Z"
+            self.company_type  = _MFG
+            self.model_version = _Z
 
         else:
-            self.company_type  = "non_manufacturing"
-            self.model_version = "Z_double_prime"
+            self.company_type  = _NON
+            self.model_version = _ZPP
 
         return self.company_type
 
@@ -63,12 +112,31 @@ class CompanyClassifier:
 
     def get_merton_applicability(self) -> bool:
         if self.total_liabilities <= 0:
-            print("  [AVISO] Sin pasivos reportados. Merton no aplicable.")
+            log.warning("  [AVISO] Sin pasivos reportados. Merton no aplicable.")
             return False
         return True
 
     def _is_manufacturing(self) -> bool:
-        return any(kw in self.industry for kw in self.MANUFACTURING_KEYWORDS)
+        self._scan()
+        return self._has_mfg
 
     def _is_financial(self) -> bool:
-        return any(kw in self.industry for kw in self.FINANCIAL_KEYWORDS)
\ No newline at end of file
+        self._scan()
+        return self._has_fin
+
+    def _scan(self) -> None:
+        """Busca keywords de ambas listas en una sola pasada y cachea el resultado."""
+        if self._scanned:
+            return
+        if self._AUTOMATON is not None:
+            for _, (group, _kw) in self._AUTOMATON.iter(self.industry):
+                if group == "mfg":
+                    self._has_mfg = True
+                else:
+                    self._has_fin = True
+                if self._has_mfg and self._has_fin:
+                    break
+        else:
+            self._has_mfg = self._MFG_RE.search(self.industry) is not None
+            self._has_fin = self._FIN_RE.search(self.industry) is not None
+        self._scanned = True
\ No newline at end of file
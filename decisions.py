@@ -5,16 +5,20 @@ BaseCreditDecision, ZScoreDecision y MertonDecision.
 Interpreta puntajes y emite decisiones crediticias.
 """
 
+import sys
+
 
 class BaseCreditDecision:
 
-    APPROVED         = "APPROVED"
-    APPROVED_WARNING = "APPROVED WITH WARNING"
-    DENIED           = "DENIED"
+    __slots__ = ("zone", "decision", "reasoning")
+
+    APPROVED         = sys.intern("APPROVED")
+    APPROVED_WARNING = sys.intern("APPROVED WITH WARNING")
+    DENIED           = sys.intern("DENIED")
 
-    ZONE_SAFE     = "SAFE"
-    ZONE_GREY     = "GREY ZONE"
-    ZONE_DISTRESS = "DISTRESS"
+    ZONE_SAFE     = sys.intern("SAFE")
+    ZONE_GREY     = sys.intern("GREY ZONE")
+    ZONE_DISTRESS = sys.intern("DISTRESS")
 
     def __init__(self):
         self.zone      = ""
@@ -41,6 +45,8 @@ class ZScoreDecision(BaseCreditDecision):
     Z'' (no manufactureras): safe >2.60 | distress <1.10
     """
 
+    __slots__ = ("z_score", "model_version")
+
     THRESHOLDS = {
         "Z":             {"safe": 2.99, "distress": 1.81},
         "Z_double_prime":{"safe": 2.60, "distress": 1.10},
@@ -82,6 +88,8 @@ class MertonDecision(BaseCreditDecision):
     PD > 5%  → DISTRESS
     """
 
+    __slots__ = ("PD", "DD")
+
     PD_SAFE     = 0.02
     PD_DISTRESS = 0.05
 
@@ -7,11 +7,20 @@ Uso:
     python main.py   #Interactivo, permite poner tickers manualmente, pero no da visualizaciones
     python main.py --tickers AAPL MSFT F  #Poner tickers directo en terminal, no da visualizaciones
     python main.py --tickers AAPL --charts #Lo anterior pero ahora si da visualizaciones
+    python main.py --tickers AAPL --no-cache #Ignora la caché en disco (.cache/) y descarga todo
+    python main.py --tickers AAPL MSFT --quiet #Oculta los mensajes [INFO]
 """
 
 import argparse
-from risk_analyzer    import RiskAnalyzer
-from report_generator import ReportGenerator
+import logging
+import sys
+
+# Separadores del banner y del resumen comparativo
+SEP_BANNER   = "=" * 60
+SUMMARY_RULE = f"  {'─'*10} {'─'*12} {'─'*12} {'─'*22}"
+
+# Loggers propios cuyos [INFO]/[AVISO] forman parte del reporte en consola
+APP_LOGGERS = ("classifier", "zscore_fetcher")
 
 
 def parse_args():
@@ -30,14 +39,22 @@ def parse_args():
         "--save", action="store_true",
         help="Guardar gráficas como PNG en lugar de mostrarlas"
     )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="No usar la caché en disco de respuestas de yfinance"
+    )
+    parser.add_argument(
+        "--quiet", action="store_true",
+        help="Ocultar mensajes informativos ([INFO]); solo avisos y errores"
+    )
     return parser.parse_args()
 
 
 def get_tickers_interactively() -> list:
-    print("\n" + "="*60)
+    print("\n" + SEP_BANNER)
     print("  SISTEMA DE ANÁLISIS DE RIESGO CREDITICIO")
     print("  Altman Z-Score + Modelo de Merton")
-    print("="*60)
+    print(SEP_BANNER)
     print("\nIngresa los tickers a analizar (separados por espacios o comas).")
     print("Ejemplos: AAPL   |   AAPL, MSFT, F\n")
     raw = input("Tickers: ").strip()
@@ -46,20 +63,45 @@ def get_tickers_interactively() -> list:
     return [t.strip().upper() for t in raw.replace(",", " ").split() if t.strip()]
 
 
+def setup_logging(quiet: bool) -> None:
+    """
+    Envía los mensajes de los loggers de la app a stdout, sin prefijos.
+    El logger raíz no se toca: los avisos de matplotlib, yfinance, etc.
+    siguen yendo a stderr y solo desde WARNING.
+    """
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    for name in APP_LOGGERS:
+        logger = logging.getLogger(name)
+        logger.setLevel(logging.WARNING if quiet else logging.INFO)
+        logger.addHandler(handler)
+        logger.propagate = False
+
+
 def main():
     args    = parse_args()
+    setup_logging(args.quiet)
     tickers = args.tickers if args.tickers else get_tickers_interactively()
 
+    # Imports pesados (yfinance, pandas, numpy, matplotlib) solo tras parsear
+    # argumentos: --help no los carga.
+    from cache            import CACHE
+    from risk_analyzer    import RiskAnalyzer
+    from report_generator import ReportGenerator
+
+    if args.no_cache:
+        CACHE.enabled = False
+
     print(f"\nAnalizando {len(tickers)} empresa(s): {', '.join(tickers)}")
 
     # Análisis
-    results_list = (
-        [RiskAnalyzer(tickers[0]).run()]
-        if len(tickers) == 1
-        else RiskAnalyzer.analyze_multiple(tickers)
-    )
+    if len(tickers) == 1:
+        results_list = [RiskAnalyzer(tickers[0]).run()]
+    else:
+        results_list = RiskAnalyzer.analyze_multiple(tickers)
 
-    # Reportes
+    # Reportes (al guardar PNGs se reutiliza una sola figura para todos los tickers)
+    chart_fig = ReportGenerator.new_figure() if args.charts and args.save else None
     for result in results_list:
         report = ReportGenerator(result)
         report.generate_console()
@@ -67,26 +109,31 @@ def main():
         if args.charts:
             ticker    = result.get("ticker", "report")
             save_path = f"risk_chart_{ticker}.png" if args.save else None
-            report.generate_charts(save_path=save_path)
+            report.generate_charts(save_path=save_path, fig=chart_fig)
 
     # Resumen comparativo (solo si hay más de una empresa)
     if len(results_list) > 1:
-        print("\n" + "="*60)
-        print("  RESUMEN COMPARATIVO")
-        print("="*60)
-        print(f"  {'Ticker':<10} {'Z-Score':<12} {'PD %':<12} {'Decisión Final'}")
-        print(f"  {'─'*10} {'─'*12} {'─'*12} {'─'*22}")
+        lines = [
+            "",
+            SEP_BANNER,
+            "  RESUMEN COMPARATIVO",
+            SEP_BANNER,
+            f"  {'Ticker':<10} {'Z-Score':<12} {'PD %':<12} {'Decisión Final'}",
+            SUMMARY_RULE,
+        ]
         for r in results_list:
             if "error" in r:
-                print(f"  {r['ticker']:<10} {'ERROR':<12} {'—':<12} {r['error'][:25]}")
+                lines.append(f"  {r['ticker']:<10} {'ERROR':<12} {'—':<12} {r['error'][:25]}")
                 continue
             z   = r["zscore"]["ratios"]["z_score"]
             pd_ = r["merton"]["results"]["PD_pct"] if r["merton"]["applicable"] else "N/A"
             dec = r["final_decision"]["decision"]
             pd_str = f"{pd_:.4f}%" if isinstance(pd_, float) else pd_
-            print(f"  {r['ticker']:<10} {z:<12.4f} {pd_str:<12} {dec}")
-        print("="*60 + "\n")
+            lines.append(f"  {r['ticker']:<10} {z:<12.4f} {pd_str:<12} {dec}")
+        lines += [SEP_BANNER, ""]
+        # Una sola escritura a stdout en lugar de un print() por fila
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
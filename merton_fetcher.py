@@ -11,10 +11,65 @@ r   = 10Y Treasury yield
 T   = 1 año
 """
 
+import threading
+import time
 import warnings
+from io import StringIO
+
 import numpy as np
+import pandas as pd
 import yfinance as yf
+
 from base_fetcher import BaseDataFetcher
+from cache        import CACHE, DEFAULT_TTL, TNX_TTL
+
+
+# Tasa ^TNX por bucket de 10 minutos. El lock serializa los misses: con
+# varios hilos de analyze_multiple solo el primero descarga.
+_TNX_RATES = {}
+_TNX_LOCK  = threading.Lock()
+
+
+def _get_tnx_rate(bucket: int) -> float:
+    """
+    Tasa libre de riesgo (^TNX / 100), memoizada por bucket de 10 minutos.
+    Es la misma para todos los tickers de una corrida: se descarga una vez.
+    Si la descarga falla se usa 4% sin memoizarlo, así el siguiente ticker
+    vuelve a intentarlo.
+    """
+    rate = _TNX_RATES.get(bucket)
+    if rate is not None:
+        return rate
+    with _TNX_LOCK:
+        rate = _TNX_RATES.get(bucket)
+        if rate is not None:
+            return rate
+        try:
+            rate = _download_tnx_rate()
+        except Exception:
+            warnings.warn(
+                "No se pudo obtener tasa libre de riesgo de ^TNX. Usando r = 4.0%.",
+                UserWarning
+            )
+            return 0.04
+        # Solo interesa el bucket vigente
+        _TNX_RATES.clear()
+        _TNX_RATES[bucket] = rate
+        return rate
+
+
+def _download_tnx_rate() -> float:
+    """^TNX / 100 desde la caché en disco o yfinance; lanza excepción si no hay precio."""
+    cached = CACHE.get(("^TNX", "rate"), ttl=TNX_TTL)
+    if cached is not None:
+        return float(cached)
+    info = yf.Ticker("^TNX").info
+    rate = info.get("regularMarketPrice") or info.get("previousClose")
+    if not rate:
+        raise ValueError("^TNX no retornó precio.")
+    rate = float(rate) / 100.0
+    CACHE.set(("^TNX", "rate"), rate)
+    return rate
 
 
 class MertonDataFetcher(BaseDataFetcher):
@@ -22,8 +77,8 @@ class MertonDataFetcher(BaseDataFetcher):
     MIN_YEARS_WARNING = 3
     MIN_YEARS_ERROR   = 2
 
-    def __init__(self, ticker: str):
-        super().__init__(ticker)
+    def __init__(self, ticker: str, yf_ticker=None):
+        super().__init__(ticker, yf_ticker)
         self.V_A              = 0.0
         self.D                = 0.0
         self.mu               = 0.0
@@ -34,7 +89,7 @@ class MertonDataFetcher(BaseDataFetcher):
         self.assets_history   = []
 
     def fetch_all(self) -> dict:
-        stock = yf.Ticker(self.ticker)
+        stock = self._stock
         self._fetch_company_info(stock)
         self._fetch_historical_balance(stock)
         self._calculate_mu_and_sigma()
@@ -52,20 +107,27 @@ class MertonDataFetcher(BaseDataFetcher):
         return data
 
     def _fetch_company_info(self, stock):
-        info = stock.info
+        # El SIC no viene en info de yfinance 0.2.66 y nadie lo consume:
+        # sic_code queda en -1 y solo se lee el nombre del info compartido.
+        info = self._get_info(stock)
         self.company_name = info.get("longName", self.ticker)
-        self.sic_code     = int(info.get("sic", -1)) if info.get("sic") else -1
 
     def _fetch_historical_balance(self, stock):
-        bs = stock.balance_sheet
+        bs = self._get_balance_sheet(stock)
         if bs is None or bs.empty:
             raise ValueError(f"[{self.ticker}] No se encontró balance sheet.")
 
-        assets_series = bs.loc["Total Assets"].dropna().sort_index()
-        liab_series   = bs.loc["Total Liabilities Net Minority Interest"].dropna().sort_index()
+        # Una sola pasada: solo años con ambos valores, en orden cronológico
+        sub = (
+            bs.loc[["Total Assets", "Total Liabilities Net Minority Interest"]]
+            .dropna(axis=1, how="any")
+            .sort_index(axis=1)
+        )
+        assets_vals = sub.iloc[0].to_numpy(dtype=np.float64)
+        liab_vals   = sub.iloc[1].to_numpy(dtype=np.float64)
 
-        self.assets_history = [float(v) for v in assets_series.values]
-        self.n_years_used   = len(self.assets_history)
+        self.assets_history = assets_vals
+        self.n_years_used   = len(assets_vals)
 
         if self.n_years_used < self.MIN_YEARS_ERROR:
             raise ValueError(
@@ -80,8 +142,8 @@ class MertonDataFetcher(BaseDataFetcher):
                 UserWarning
             )
 
-        self.V_A = self.assets_history[-1]
-        self.D   = float(liab_series.values[-1])
+        self.V_A = float(assets_vals[-1])
+        self.D   = float(liab_vals[-1])
 
     def _calculate_mu_and_sigma(self):
         """
@@ -90,34 +152,34 @@ class MertonDataFetcher(BaseDataFetcher):
         μ = media de las variaciones anuales
         σ = desviación estándar de las variaciones anuales
         """
-        assets      = self.assets_history
-        pct_changes = []
-
-        for i in range(1, len(assets)):
-            prev = assets[i - 1]
-            curr = assets[i]
-            if prev == 0:
-                continue
-            pct_changes.append((curr - prev) / abs(prev))
+        arr  = np.asarray(self.assets_history, dtype=np.float64)
+        prev = arr[:-1]
+        mask = prev != 0.0
+        pct  = np.diff(arr)[mask] / np.abs(prev[mask])
 
-        if len(pct_changes) < 1:
+        if pct.size < 1:
             raise ValueError("No hay suficientes variaciones para calcular μ y σ.")
 
-        self.mu    = float(np.mean(pct_changes))
-        self.sigma = float(np.std(pct_changes, ddof=1)) if len(pct_changes) > 1 else abs(pct_changes[0])
+        self.mu    = float(pct.mean())
+        self.sigma = float(pct.std(ddof=1)) if pct.size > 1 else float(np.abs(pct[0]))
 
     def _fetch_risk_free_rate(self):
-        try:
-            tnx  = yf.Ticker("^TNX")
-            info = tnx.info
-            rate = info.get("regularMarketPrice") or info.get("previousClose")
-            if rate:
-                self.risk_free_rate = float(rate) / 100.0
-            else:
-                raise ValueError("^TNX no retornó precio.")
-        except Exception:
-            warnings.warn(
-                "No se pudo obtener tasa libre de riesgo de ^TNX. Usando r = 4.0%.",
-                UserWarning
-            )
-            self.risk_free_rate = 0.04
\ No newline at end of file
+        self.risk_free_rate = _get_tnx_rate(int(time.time() // TNX_TTL))
+
+    # ── Caché de respuestas de yfinance ────────────────────────────────
+
+    def _get_info(self, stock) -> dict:
+        info = CACHE.get((self.ticker, "info"), ttl=DEFAULT_TTL)
+        if info is None:
+            info = stock.info
+            CACHE.set((self.ticker, "info"), info)
+        return info
+
+    def _get_balance_sheet(self, stock):
+        raw = CACHE.get((self.ticker, "balance_sheet"), ttl=DEFAULT_TTL)
+        if raw is not None:
+            return pd.read_json(StringIO(raw), orient="split")
+        bs = stock.balance_sheet
+        if bs is not None and not bs.empty:
+            CACHE.set((self.ticker, "balance_sheet"), bs.to_json(orient="split"))
+        return bs
\ No newline at end of file
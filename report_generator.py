@@ -3,9 +3,25 @@ report_generator.py
 -------------------
 Genera reportes en consola y visualizaciones con matplotlib.
 """
-import matplotlib.pyplot as plt
+import hashlib
+import io
+import json
+import os
+import sys
 from datetime import datetime
 
+import numpy as np
+
+# matplotlib solo hace falta con --charts. Figure, Agg y patches no tocan el
+# backend GUI; pyplot se importa solo para plt.show() en generate_charts.
+try:
+    import matplotlib
+    import matplotlib.patches as mpatches
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+except ImportError:
+    matplotlib = mpatches = FigureCanvasAgg = Figure = None
+
 
 # Colores ANSI para consola
 GREEN  = "\033[92m"
@@ -19,96 +35,151 @@ DECISION_COLORS = {
     "DENIED":                RED,
 }
 
+# Etiqueta coloreada de cada decisión, construida una sola vez
+DECISION_LABEL = {k: f"{v}{k}{RESET}" for k, v in DECISION_COLORS.items()}
+
+# Separadores del reporte de consola
+SEP_THICK = "═" * 60
+SEP_THIN  = "─" * 60
+SEP_BANG  = "!" * 60
+SEP_SHORT = "─" * 35
+
+# Curva normal estándar en [-4, 4]: es la misma para todos los tickers
+_X_NORMAL = np.linspace(-4, 4, 400)
+_Y_NORMAL = np.exp(-0.5 * _X_NORMAL**2) / np.sqrt(2 * np.pi)
+_X_NORMAL.setflags(write=False)
+_Y_NORMAL.setflags(write=False)
+
+# Gráficas ya renderizadas: {(digest de resultados, fecha, dpi, formato): bytes}
+_RENDER_CACHE      = {}
+_RENDER_CACHE_SIZE = 32
+
+
+def _results_digest(results: dict) -> str:
+    """Hash estable de un dict de resultados (JSON canónico)."""
+    payload = json.dumps(results, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def format_result(res: dict, precision: int = 4) -> dict:
+    """Copia de un dict de resultados con los floats redondeados para mostrar."""
+    return {
+        k: round(v, precision) if isinstance(v, float) else v
+        for k, v in res.items()
+    }
+
 
 class ReportGenerator:
 
     def __init__(self, results: dict):
-        self.results = results
+        self.results    = results
+        # Una sola marca de tiempo por reporte: consola y gráfica coinciden
+        self._report_ts = datetime.now()
 
     def generate_console(self) -> None:
         """Imprime el reporte completo en consola con colores."""
-        r   = self.results
-        sep = "─" * 60
+        r     = self.results
+        lines = []
+        out   = lines.append
 
         if "error" in r:
-            print(f"\n{'!'*60}")
-            print(f"  ERROR en {r['ticker']}: {r['error']}")
-            print(f"{'!'*60}\n")
+            out(f"\n{SEP_BANG}")
+            out(f"  ERROR en {r['ticker']}: {r['error']}")
+            out(f"{SEP_BANG}\n")
+            self._write(lines)
             return
 
         # Encabezado
-        print(f"\n{'═'*60}")
-        print(f"  REPORTE DE RIESGO CREDITICIO")
-        print(f"  {r['company_name']} ({r['ticker']})")
-        print(f"  Fecha: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-        print(f"{'═'*60}")
-        print(f"\n  Tipo de empresa : {r['company_type']}")
-        print(f"  Industry        : {r['industry']}")
+        out(f"\n{SEP_THICK}")
+        out(f"  REPORTE DE RIESGO CREDITICIO")
+        out(f"  {r['company_name']} ({r['ticker']})")
+        out(f"  Fecha: {self._report_ts.strftime('%Y-%m-%d %H:%M')}")
+        out(f"{SEP_THICK}")
+        out(f"\n  Tipo de empresa : {r['company_type']}")
+        out(f"  Industry        : {r['industry']}")
 
         # Z-Score
-        print(f"\n{sep}")
-        print(f"  ALTMAN Z-SCORE  [{r['zscore']['model_version']}]")
-        print(sep)
-        rt = r["zscore"]["ratios"]
-        print(f"  X1 (WC/TA)     : {rt['x1']:>10.4f}")
-        print(f"  X2 (RE/TA)     : {rt['x2']:>10.4f}")
-        print(f"  X3 (EBIT/TA)   : {rt['x3']:>10.4f}")
-        print(f"  X4 (MVE/TL)    : {rt['x4']:>10.4f}")
+        out(f"\n{SEP_THIN}")
+        out(f"  ALTMAN Z-SCORE  [{r['zscore']['model_version']}]")
+        out(SEP_THIN)
+        rt = format_result(r["zscore"]["ratios"])
+        out(f"  X1 (WC/TA)     : {rt['x1']:>10.4f}")
+        out(f"  X2 (RE/TA)     : {rt['x2']:>10.4f}")
+        out(f"  X3 (EBIT/TA)   : {rt['x3']:>10.4f}")
+        out(f"  X4 (MVE/TL)    : {rt['x4']:>10.4f}")
         if rt["x5"] != 0.0:
-            print(f"  X5 (S/TA)      : {rt['x5']:>10.4f}")
-        print(f"  {'─'*35}")
-        print(f"  Z-Score        : {rt['z_score']:>10.4f}")
+            out(f"  X5 (S/TA)      : {rt['x5']:>10.4f}")
+        out(f"  {SEP_SHORT}")
+        out(f"  Z-Score        : {rt['z_score']:>10.4f}")
         z_dec = r["zscore"]["decision"]
-        color = DECISION_COLORS.get(z_dec["decision"], "")
-        print(f"  Zona           : {z_dec['zone']}")
-        print(f"  Decisión       : {color}{z_dec['decision']}{RESET}")
-        print(f"  Detalle        : {z_dec['reasoning']}")
+        out(f"  Zona           : {z_dec['zone']}")
+        out(f"  Decisión       : {DECISION_LABEL.get(z_dec['decision'], z_dec['decision'])}")
+        out(f"  Detalle        : {z_dec['reasoning']}")
 
         # Merton
-        print(f"\n{sep}")
-        print(f"  MODELO DE MERTON")
-        print(sep)
+        out(f"\n{SEP_THIN}")
+        out(f"  MODELO DE MERTON")
+        out(SEP_THIN)
         if not r["merton"]["applicable"]:
-            print("  No aplicable para esta empresa.")
+            out("  No aplicable para esta empresa.")
         else:
-            m = r["merton"]["results"]
-            print(f"  V_A (activos)  : ${m['V_A']:>20,.0f}")
-            print(f"  D   (pasivos)  : ${m['D']:>20,.0f}")
-            print(f"  μ   (drift)    : {m['mu']:>10.4f}")
-            print(f"  σ   (volat.)   : {m['sigma']:>10.4f}")
-            print(f"  T   (años)     : {m['T']:>10.1f}")
-            print(f"  {'─'*35}")
-            print(f"  DD             : {m['DD']:>10.4f}")
-            print(f"  PD             : {m['PD_pct']:>10.4f}%")
+            m = format_result(r["merton"]["results"])
+            out(f"  V_A (activos)  : ${m['V_A']:>20,.0f}")
+            out(f"  D   (pasivos)  : ${m['D']:>20,.0f}")
+            out(f"  μ   (drift)    : {m['mu']:>10.4f}")
+            out(f"  σ   (volat.)   : {m['sigma']:>10.4f}")
+            out(f"  T   (años)     : {m['T']:>10.1f}")
+            out(f"  {SEP_SHORT}")
+            out(f"  DD             : {m['DD']:>10.4f}")
+            out(f"  PD             : {m['PD_pct']:>10.4f}%")
             m_dec = r["merton"]["decision"]
-            color = DECISION_COLORS.get(m_dec["decision"], "")
-            print(f"  Zona           : {m_dec['zone']}")
-            print(f"  Decisión       : {color}{m_dec['decision']}{RESET}")
-            print(f"  Detalle        : {m_dec['reasoning']}")
+            out(f"  Zona           : {m_dec['zone']}")
+            out(f"  Decisión       : {DECISION_LABEL.get(m_dec['decision'], m_dec['decision'])}")
+            out(f"  Detalle        : {m_dec['reasoning']}")
 
         # Decisión final
-        print(f"\n{'═'*60}")
-        print(f"  DECISIÓN FINAL DE CRÉDITO")
-        print(f"{'═'*60}")
-        fd    = r["final_decision"]
-        color = DECISION_COLORS.get(fd["decision"], "")
-        print(f"  Decisión : {color}{fd['decision']}{RESET}")
-        print(f"  Basado en: {fd['basis']}")
-        print(f"{'═'*60}\n")
-
-    def generate_charts(self, save_path: str = None) -> None:
+        out(f"\n{SEP_THICK}")
+        out(f"  DECISIÓN FINAL DE CRÉDITO")
+        out(f"{SEP_THICK}")
+        fd = r["final_decision"]
+        out(f"  Decisión : {DECISION_LABEL.get(fd['decision'], fd['decision'])}")
+        out(f"  Basado en: {fd['basis']}")
+        out(f"{SEP_THICK}\n")
+        self._write(lines)
+
+    @staticmethod
+    def _write(lines: list) -> None:
+        """Una sola escritura a stdout por reporte en lugar de un print() por línea."""
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+    @staticmethod
+    def new_figure(n_rows: int = 3):
+        """
+        Figure con canvas Agg, fuera de pyplot (sin registro de figuras ni
+        backend GUI). Se puede reutilizar entre tickers al guardar PNGs
+        (ver generate_charts(fig=...)). None si matplotlib no está instalado.
+        """
+        if matplotlib is None:
+            return None
+        fig = Figure(figsize=(14, 5 * n_rows), layout="constrained")
+        FigureCanvasAgg(fig)
+        return fig
+
+    def generate_charts(self, save_path: str = None, fig=None, dpi: int = 96) -> None:
         """
         Genera visualizaciones con matplotlib:
         1. Gauge del Z-Score
         2. Tabla de ratios X1-X5
         3. Visualización de DD y PD (si Merton aplica)
         4. Panel de decisión final
+
+        Si se pasa fig (con save_path), se limpia y reutiliza en lugar de
+        crear una figura nueva por ticker. Al guardar, la imagen renderizada
+        se memoiza por (resultados, dpi, formato): repetir la llamada con los
+        mismos resultados solo reescribe los bytes.
         """
-        try:
-            import matplotlib.pyplot  as plt
-            import matplotlib.patches as mpatches
-            import numpy as np
-        except ImportError:
+        if matplotlib is None:
             print("[CHARTS] matplotlib no instalado. Ejecuta: pip install matplotlib")
             return
 
@@ -118,52 +189,72 @@ class ReportGenerator:
             return
 
         merton_ok = r["merton"]["applicable"] and r["merton"]["results"] is not None
-        n_cols    = 2
         n_rows    = 3 if merton_ok else 2
 
-        fig = plt.figure(figsize=(14, 5 * n_rows))
+        if not save_path:
+            # plt.show() necesita una figura gestionada por pyplot
+            import matplotlib.pyplot as plt
+            fig = plt.figure(figsize=(14, 5 * n_rows), layout="constrained")
+            self._draw_figure(fig, r, n_rows, merton_ok)
+            plt.show()
+            return
+
+        fmt = os.path.splitext(save_path)[1][1:].lower() or "png"
+        # La fecha va en el título, así que también forma parte de la clave
+        key = (_results_digest(r), self._report_ts.date(), dpi, fmt)
+        img = _RENDER_CACHE.get(key)
+        if img is None:
+            if fig is None:
+                fig = self.new_figure(n_rows)
+            else:
+                fig.clear()
+                fig.set_size_inches(14, 5 * n_rows)
+            self._draw_figure(fig, r, n_rows, merton_ok)
+            buf = io.BytesIO()
+            fig.savefig(buf, format=fmt, dpi=dpi)
+            img = buf.getvalue()
+            if len(_RENDER_CACHE) >= _RENDER_CACHE_SIZE:
+                _RENDER_CACHE.pop(next(iter(_RENDER_CACHE)))
+            _RENDER_CACHE[key] = img
+
+        with open(save_path, "wb") as f:
+            f.write(img)
+        print(f"[CHARTS] Gráfica guardada: {save_path}")
+
+    def _draw_figure(self, fig, r: dict, n_rows: int, merton_ok: bool) -> None:
+        """Dibuja título y paneles del reporte sobre fig (ya limpia)."""
+        gs = fig.add_gridspec(n_rows, 2)
         fig.suptitle(
             f"Análisis de Riesgo Crediticio — {r['company_name']} ({r['ticker']})\n"
-            f"{datetime.now().strftime('%Y-%m-%d')}",
-            fontsize=14, fontweight="bold", y=0.98
+            f"{self._report_ts.strftime('%Y-%m-%d')}",
+            fontsize=14, fontweight="bold"
         )
 
         # ── 1. Gauge Z-Score ──────────────────────────────────────────
-        ax1 = fig.add_subplot(n_rows, n_cols, 1)
+        ax1 = fig.add_subplot(gs[0, 0])
         self._plot_zscore_gauge(ax1, r)
 
         # ── 2. Tabla de ratios ────────────────────────────────────────
-        ax2 = fig.add_subplot(n_rows, n_cols, 2)
+        ax2 = fig.add_subplot(gs[0, 1])
         self._plot_ratios_table(ax2, r)
 
         if merton_ok:
             # ── 3. Visualización DD / PD ──────────────────────────────
-            ax3 = fig.add_subplot(n_rows, n_cols, 3)
+            ax3 = fig.add_subplot(gs[1, 0])
             self._plot_merton_normal(ax3, r)
 
             # ── 4. Tabla Merton ───────────────────────────────────────
-            ax4 = fig.add_subplot(n_rows, n_cols, 4)
+            ax4 = fig.add_subplot(gs[1, 1])
             self._plot_merton_table(ax4, r)
 
         # ── 5. Panel decisión final ───────────────────────────────────
-        ax5 = fig.add_subplot(n_rows, n_cols, (n_cols * (n_rows - 1) + 1, n_cols * n_rows))
+        ax5 = fig.add_subplot(gs[-1, :])
         self._plot_final_decision(ax5, r)
 
-        plt.tight_layout(rect=[0, 0, 1, 0.96])
-
-        if save_path:
-            plt.savefig(save_path, dpi=150, bbox_inches="tight")
-            print(f"[CHARTS] Gráfica guardada: {save_path}")
-        else:
-            plt.show()
-
     # ── Subplots ───────────────────────────────────────────────────────
 
     def _plot_zscore_gauge(self, ax, r: dict) -> None:
         """Barra horizontal que muestra el Z-Score en su zona correspondiente."""
-        import numpy as np
-        import matplotlib.patches as mpatches
-
         mv     = r["zscore"]["model_version"]
         z      = r["zscore"]["ratios"]["z_score"]
         thresholds = {"Z": (1.81, 2.99), "Z_double_prime": (1.10, 2.60)}
@@ -203,57 +294,38 @@ class ReportGenerator:
 
     def _plot_ratios_table(self, ax, r: dict) -> None:
         """Tabla con los valores de X1-X5."""
-        ax.axis("off")
         mv  = r["zscore"]["model_version"]
         rt  = r["zscore"]["ratios"]
 
         rows = [
-            ["X1", "Working Capital / Total Assets",    f"{rt['x1']:.4f}"],
-            ["X2", "Retained Earnings / Total Assets",  f"{rt['x2']:.4f}"],
-            ["X3", "EBIT / Total Assets",               f"{rt['x3']:.4f}"],
-            ["X4", "Market Cap / Total Liabilities",    f"{rt['x4']:.4f}"],
+            ("X1", "Working Capital / Total Assets",    f"{rt['x1']:.4f}"),
+            ("X2", "Retained Earnings / Total Assets",  f"{rt['x2']:.4f}"),
+            ("X3", "EBIT / Total Assets",               f"{rt['x3']:.4f}"),
+            ("X4", "Market Cap / Total Liabilities",    f"{rt['x4']:.4f}"),
         ]
         if mv == "Z":
-            rows.append(["X5", "Sales / Total Assets", f"{rt['x5']:.4f}"])
-
-        col_labels = ["Variable", "Descripción", "Valor"]
-        table = ax.table(
-            cellText    = rows,
-            colLabels   = col_labels,
-            loc         = "center",
-            cellLoc     = "left",
+            rows.append(("X5", "Sales / Total Assets", f"{rt['x5']:.4f}"))
+
+        fmt = "{:<9}{:<34}{:>10}"
+        self._plot_text_table(
+            ax,
+            header       = fmt.format("Variable", "Descripción", "Valor"),
+            lines        = [fmt.format(*row) for row in rows],
+            header_color = "#2c3e50",
         )
-        table.auto_set_font_size(False)
-        table.set_fontsize(9)
-        table.scale(1, 1.6)
-
-        for (row, col), cell in table.get_celld().items():
-            if row == 0:
-                cell.set_facecolor("#2c3e50")
-                cell.set_text_props(color="white", fontweight="bold")
-            elif row % 2 == 0:
-                cell.set_facecolor("#f5f5f5")
-
         ax.set_title("Ratios del Z-Score", fontweight="bold")
 
     def _plot_merton_normal(self, ax, r: dict) -> None:
         """Distribución normal estándar con DD marcado y área PD sombreada."""
-        import numpy as np
-        from math import erf, sqrt as msqrt
-
         m  = r["merton"]["results"]
         DD = m["DD"]
         PD = m["PD_pct"]
 
-        x  = np.linspace(-4, 4, 400)
-        y  = np.exp(-0.5 * x**2) / np.sqrt(2 * np.pi)
-
-        ax.plot(x, y, color="#2c3e50", linewidth=2)
+        ax.plot(_X_NORMAL, _Y_NORMAL, color="#2c3e50", linewidth=2)
 
-        # Área de default (izquierda de -DD)
-        x_fill = np.linspace(-4, -DD, 200)
-        y_fill = np.exp(-0.5 * x_fill**2) / np.sqrt(2 * np.pi)
-        ax.fill_between(x_fill, y_fill, alpha=0.4,
+        # Área de default (izquierda de -DD): vistas de la curva precalculada
+        idx = np.searchsorted(_X_NORMAL, -DD, side="right")
+        ax.fill_between(_X_NORMAL[:idx], _Y_NORMAL[:idx], alpha=0.4,
                         color="#e74c3c", label=f"PD = {PD:.4f}%")
 
         ax.axvline(x=-DD, color="#e74c3c", linewidth=2,
@@ -267,37 +339,48 @@ class ReportGenerator:
 
     def _plot_merton_table(self, ax, r: dict) -> None:
         """Tabla con los parámetros del modelo de Merton."""
-        ax.axis("off")
         m = r["merton"]["results"]
 
         rows = [
-            ["V_A", f"${m['V_A']:,.0f}"],
-            ["D",   f"${m['D']:,.0f}"],
-            ["μ",   f"{m['mu']:.4f}"],
-            ["σ",   f"{m['sigma']:.4f}"],
-            ["T",   f"{m['T']:.1f} año"],
-            ["DD",  f"{m['DD']:.4f}"],
-            ["PD",  f"{m['PD_pct']:.4f}%"],
+            ("V_A", f"${m['V_A']:,.0f}"),
+            ("D",   f"${m['D']:,.0f}"),
+            ("μ",   f"{m['mu']:.4f}"),
+            ("σ",   f"{m['sigma']:.4f}"),
+            ("T",   f"{m['T']:.1f} año"),
+            ("DD",  f"{m['DD']:.4f}"),
+            ("PD",  f"{m['PD_pct']:.4f}%"),
         ]
-        table = ax.table(
-            cellText  = rows,
-            colLabels = ["Variable", "Valor"],
-            loc       = "center",
-            cellLoc   = "center",
-        )
-        table.auto_set_font_size(False)
-        table.set_fontsize(9)
-        table.scale(1, 1.6)
-
-        for (row, col), cell in table.get_celld().items():
-            if row == 0:
-                cell.set_facecolor("#16213e")
-                cell.set_text_props(color="white", fontweight="bold")
-            elif row % 2 == 0:
-                cell.set_facecolor("#f5f5f5")
 
+        fmt = "{:<12}{:>24}"
+        self._plot_text_table(
+            ax,
+            header       = fmt.format("Variable", "Valor"),
+            lines        = [fmt.format(*row) for row in rows],
+            header_color = "#16213e",
+        )
         ax.set_title("Parámetros Merton", fontweight="bold")
 
+    @staticmethod
+    def _plot_text_table(ax, header: str, lines: list, header_color: str) -> None:
+        """
+        Tabla como bloque de texto monoespaciado: una franja de color para el
+        encabezado y un solo ax.text para las filas (sin celdas de ax.table).
+        """
+        ax.axis("off")
+        ax.add_patch(mpatches.Rectangle(
+            (0.0, 0.84), 1.0, 0.1, transform=ax.transAxes,
+            color=header_color, clip_on=False,
+        ))
+        ax.text(
+            0.02, 0.89, header, transform=ax.transAxes,
+            family="monospace", fontsize=9, fontweight="bold",
+            color="white", va="center",
+        )
+        ax.text(
+            0.02, 0.80, "\n".join(lines), transform=ax.transAxes,
+            family="monospace", fontsize=9, va="top", linespacing=1.8,
+        )
+
     def _plot_final_decision(self, ax, r: dict) -> None:
         """Panel central con la decisión final destacada."""
         ax.axis("off")
@@ -334,7 +417,7 @@ class ReportGenerator:
             fontsize=9, ha="center", va="center", color="white", alpha=0.85
         )
 
-        rect = plt.Rectangle((0, 0), 1, 1, transform=ax.transAxes,
-                              color=bg_color, zorder=-1)
+        rect = mpatches.Rectangle((0, 0), 1, 1, transform=ax.transAxes,
+                                  color=bg_color, zorder=-1)
         ax.add_patch(rect)
         ax.set_title("DECISIÓN FINAL DE CRÉDITO", fontweight="bold", fontsize=12)
\ No newline at end of file
@@ -5,51 +5,152 @@ Orquestador del sistema. Único punto de entrada para el usuario.
 Coordina fetchers, classifier, calculators y decisions.
 """
 
+import logging
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import yfinance as yf
+
 from zscore_fetcher  import ZScoreDataFetcher
 from merton_fetcher  import MertonDataFetcher
 from classifier      import CompanyClassifier
 from calculators     import ZScoreCalculator, MertonCalculator
-from decisions       import ZScoreDecision, MertonDecision
+from decisions       import BaseCreditDecision, ZScoreDecision, MertonDecision
+
+_APPROVED = BaseCreditDecision.APPROVED
+_WARNING  = BaseCreditDecision.APPROVED_WARNING
+_DENIED   = BaseCreditDecision.DENIED
+
+SEP_BANNER = "=" * 60
+
+# Buffer de progreso del ticker que se está analizando en este hilo
+_progress = threading.local()
+
+
+class _ProgressFilter(logging.Filter):
+    """
+    Desvía los [INFO]/[AVISO] emitidos durante una fase al buffer del ticker
+    en curso, para que salgan junto al resto de su progreso y no mezclados
+    con los de otros hilos.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        lines = getattr(_progress, "lines", None)
+        if lines is None:
+            return True
+        lines.append(record.getMessage())
+        return False
+
+
+for _logger_name in (ZScoreDataFetcher.__module__, CompanyClassifier.__module__):
+    logging.getLogger(_logger_name).addFilter(_ProgressFilter())
 
 
 class RiskAnalyzer:
 
+    # Decisión final conservadora para cada par (Z-Score, Merton):
+    # cualquier DENIED → DENIED, ambos APPROVED → APPROVED, resto → WARNING
+    _COMBINE = {
+        (_APPROVED, _APPROVED): _APPROVED,
+        (_APPROVED, _WARNING):  _WARNING,
+        (_APPROVED, _DENIED):   _DENIED,
+        (_WARNING,  _APPROVED): _WARNING,
+        (_WARNING,  _WARNING):  _WARNING,
+        (_WARNING,  _DENIED):   _DENIED,
+        (_DENIED,   _APPROVED): _DENIED,
+        (_DENIED,   _WARNING):  _DENIED,
+        (_DENIED,   _DENIED):   _DENIED,
+    }
+
     def __init__(self, ticker: str):
         self.ticker  = ticker.upper().strip()
         self.results = {}
+        self._lines  = []   # progreso pendiente de escribir (ver flush_progress)
+        # Se crea en _prepare: así un yf.Ticker que falla (p. ej. un ISIN
+        # inválido) queda dentro del manejo de errores de ese ticker
+        self.stock   = None
 
     def run(self) -> dict:
-        print(f"\n{'='*60}")
-        print(f"  Analizando: {self.ticker}")
-        print(f"{'='*60}")
+        try:
+            self._in_phase(self._prepare)
+        finally:
+            self.flush_progress()
+        z_results = ZScoreCalculator(self._z_data, self._model_version).calculate()
+        try:
+            return self._in_phase(self._finish, z_results)
+        finally:
+            self.flush_progress()
+
+    def flush_progress(self) -> None:
+        """Escribe de una vez las líneas de progreso acumuladas de este ticker."""
+        if self._lines:
+            sys.stdout.write("\n".join(self._lines) + "\n")
+            sys.stdout.flush()
+            self._lines.clear()
+
+    def _say(self, text: str = "") -> None:
+        self._lines.append(text)
+
+    def _in_phase(self, func, *args):
+        """Ejecuta func(*args) capturando los logs de este hilo en self._lines."""
+        _progress.lines = self._lines
+        try:
+            return func(*args)
+        finally:
+            _progress.lines = None
+
+    def _prepare(self) -> None:
+        """Pasos 1-2: descarga de datos Z-Score y clasificación."""
+        say = self._say
+        say(f"\n{SEP_BANNER}")
+        say(f"  Analizando: {self.ticker}")
+        say(SEP_BANNER)
 
         # ── PASO 1: Datos Z-Score ─────────────────────────────────────
-        print("\n[1/5] Descargando datos financieros (Z-Score)...")
-        z_fetcher = ZScoreDataFetcher(self.ticker)
+        say("\n[1/5] Descargando datos financieros (Z-Score)...")
+        # Un solo yf.Ticker para ambos fetchers: comparte las respuestas que
+        # yfinance guarda dentro del objeto. La sesión HTTP es la de yfinance,
+        # una para todo el proceso, así que no se pasa ni se cierra aquí
+        self.stock = yf.Ticker(self.ticker)
+        z_fetcher  = ZScoreDataFetcher(self.ticker, yf_ticker=self.stock)
         z_data    = z_fetcher.fetch_all()
-        print(f"      Empresa : {z_fetcher.company_name}")
-        print(f"      Industry: {z_fetcher.industry}")
+        say(f"      Empresa : {z_fetcher.company_name}")
+        say(f"      Industry: {z_fetcher.industry}")
 
         # ── PASO 2: Clasificación ─────────────────────────────────────
-        print("\n[2/5] Clasificando empresa...")
+        say("\n[2/5] Clasificando empresa...")
         classifier = CompanyClassifier(
             industry          = z_fetcher.industry,
             total_liabilities = z_data["total_liabilities"],
         )
         company_type  = classifier.classify()
         model_version = classifier.get_model_version()
-        print(f"      Tipo    : {company_type}")
-        print(f"      Modelo  : {model_version}")
+        say(f"      Tipo    : {company_type}")
+        say(f"      Modelo  : {model_version}")
+
+        self._z_fetcher     = z_fetcher
+        self._z_data        = z_data
+        self._classifier    = classifier
+        self._company_type  = company_type
+        self._model_version = model_version
+
+    def _finish(self, z_results: dict) -> dict:
+        """Pasos 3-5: decisión Z-Score, Merton y consolidación."""
+        say           = self._say
+        z_fetcher     = self._z_fetcher
+        classifier    = self._classifier
+        company_type  = self._company_type
+        model_version = self._model_version
 
         # ── PASO 3: Z-Score ───────────────────────────────────────────
-        print("\n[3/5] Calculando Z-Score...")
-        z_calc    = ZScoreCalculator(z_data, model_version)
-        z_results = z_calc.calculate()
-        print(f"      Z-Score : {z_results['z_score']}")
+        # Con varios tickers esta fase se escribe lejos del banner: se repite el ticker
+        say(f"\n[3/5] Calculando Z-Score ({self.ticker})...")
+        say(f"      Z-Score : {z_results['z_score']:.4f}")
 
         z_dec_obj = ZScoreDecision(z_results["z_score"], model_version)
         z_dec     = z_dec_obj.evaluate()
-        print(f"      Decisión: {z_dec['decision']} ({z_dec['zone']})")
+        say(f"      Decisión: {z_dec['decision']} ({z_dec['zone']})")
 
         # ── PASO 4: Datos Merton ──────────────────────────────────────
         merton_applicable = classifier.get_merton_applicability()
@@ -57,27 +158,27 @@ class RiskAnalyzer:
         merton_dec        = None
 
         if merton_applicable:
-            print("\n[4/5] Descargando datos financieros (Merton)...")
-            m_fetcher = MertonDataFetcher(self.ticker)
+            say("\n[4/5] Descargando datos financieros (Merton)...")
+            m_fetcher = MertonDataFetcher(self.ticker, yf_ticker=self.stock)
             m_data    = m_fetcher.fetch_all()
-            print(f"      Años usados : {m_fetcher.n_years_used}")
-            print(f"      μ  (drift)  : {m_data['mu']:.4f}")
-            print(f"      σ  (volat.) : {m_data['sigma']:.4f}")
-            print(f"      r           : {m_data['risk_free_rate']:.4f}")
+            say(f"      Años usados : {m_fetcher.n_years_used}")
+            say(f"      μ  (drift)  : {m_data['mu']:.4f}")
+            say(f"      σ  (volat.) : {m_data['sigma']:.4f}")
+            say(f"      r           : {m_data['risk_free_rate']:.4f}")
 
             # ── PASO 5: Merton ────────────────────────────────────────
-            print("\n[5/5] Calculando modelo de Merton...")
+            say("\n[5/5] Calculando modelo de Merton...")
             m_calc         = MertonCalculator(m_data)
             merton_results = m_calc.calculate()
-            print(f"      DD          : {merton_results['DD']:.4f}")
-            print(f"      PD          : {merton_results['PD_pct']:.4f}%")
+            say(f"      DD          : {merton_results['DD']:.4f}")
+            say(f"      PD          : {merton_results['PD_pct']:.4f}%")
 
             m_dec_obj  = MertonDecision(merton_results["PD"], merton_results["DD"])
             merton_dec = m_dec_obj.evaluate()
-            print(f"      Decisión    : {merton_dec['decision']} ({merton_dec['zone']})")
+            say(f"      Decisión    : {merton_dec['decision']} ({merton_dec['zone']})")
         else:
-            print("\n[4/5] Merton no aplicable.")
-            print("[5/5] Saltando cálculo de Merton.")
+            say("\n[4/5] Merton no aplicable.")
+            say("[5/5] Saltando cálculo de Merton.")
 
         # ── CONSOLIDAR ────────────────────────────────────────────────
         self.results = {
@@ -105,17 +206,82 @@ class RiskAnalyzer:
         return self.results
 
     @staticmethod
-    def analyze_multiple(tickers: list) -> list:
-        """Analiza varios tickers en secuencia. Captura errores individuales."""
-        all_results = []
-        for ticker in tickers:
-            try:
-                analyzer = RiskAnalyzer(ticker)
-                all_results.append(analyzer.run())
-            except Exception as e:
-                print(f"\n  [ERROR] No se pudo analizar {ticker}: {e}")
-                all_results.append({"ticker": ticker, "error": str(e)})
-        return all_results
+    def analyze_multiple(tickers: list, max_workers: int = 8) -> list:
+        """
+        Analiza varios tickers en paralelo (hilos). Captura errores individuales.
+        La descarga de yfinance es I/O de red, así que los hilos solapan la
+        latencia de cada ticker. El orden del resultado respeta el de entrada.
+        max_workers limita las descargas simultáneas (rate limit de Yahoo):
+        todos los hilos usan la misma sesión HTTP de yfinance.
+        """
+        if not tickers:
+            return []
+        analyzers = [RiskAnalyzer(t) for t in tickers]
+        results   = [None] * len(analyzers)
+        RiskAnalyzer._run_phases(analyzers, results, max_workers)
+        return results
+
+    @staticmethod
+    def _run_phases(analyzers: list, results: list, max_workers: int) -> None:
+        """
+        Fases de analyze_multiple; escribe cada resultado en results[i].
+        Los hilos solo acumulan progreso: el hilo principal lo escribe por
+        ticker y en el orden de entrada al terminar cada fase.
+        """
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(analyzers)))) as executor:
+            # Fase 1: descarga + clasificación (I/O de red, en paralelo)
+            prepared = executor.map(lambda a: RiskAnalyzer._guard(a, a._prepare), analyzers)
+            batch    = []
+            for i, err in enumerate(prepared):
+                analyzers[i].flush_progress()
+                if err is None:
+                    batch.append(i)
+                else:
+                    results[i] = err
+
+            # Fase 2: Z-Score vectorizado para todos los tickers válidos
+            z_list = RiskAnalyzer._zscore_batch([analyzers[i] for i in batch])
+
+            # Fase 3: decisiones + Merton (I/O de red, en paralelo)
+            finished = executor.map(
+                lambda i, z: z if "error" in z else RiskAnalyzer._guard(analyzers[i], analyzers[i]._finish, z),
+                batch, z_list,
+            )
+            for i, res in zip(batch, finished):
+                analyzers[i].flush_progress()
+                results[i] = res
+
+    @staticmethod
+    def _zscore_batch(analyzers: list) -> list:
+        try:
+            return ZScoreCalculator.calculate_batch(
+                [a._z_data for a in analyzers],
+                [a._model_version for a in analyzers],
+            )
+        except Exception:
+            # Algún ticker rompe el lote (TA/TL en 0, versión o campo inválido):
+            # se calcula uno a uno para aislar el error en ese ticker
+            return [
+                RiskAnalyzer._guard(a, RiskAnalyzer._zscore_single, a)
+                for a in analyzers
+            ]
+
+    @staticmethod
+    def _zscore_single(analyzer) -> dict:
+        """Z-Score de un solo ticker ya preparado."""
+        return ZScoreCalculator(analyzer._z_data, analyzer._model_version).calculate()
+
+    @staticmethod
+    def _guard(analyzer, func, *args):
+        """
+        Ejecuta func(*args) dentro de una fase del analyzer; si falla, anota
+        el error en su progreso y retorna el dict de error del ticker.
+        """
+        try:
+            return analyzer._in_phase(func, *args)
+        except Exception as e:
+            analyzer._say(f"\n  [ERROR] No se pudo analizar {analyzer.ticker}: {e}")
+            return {"ticker": analyzer.ticker, "error": str(e)}
 
     def _combine_decisions(self, z_dec: dict, merton_dec: dict) -> dict:
         """
@@ -130,14 +296,7 @@ class RiskAnalyzer:
                 "basis":    "Z-Score únicamente (Merton no aplicable)",
             }
 
-        decisions = {z_dec["decision"], merton_dec["decision"]}
-
-        if "DENIED" in decisions:
-            final = "DENIED"
-        elif decisions == {"APPROVED"}:
-            final = "APPROVED"
-        else:
-            final = "APPROVED WITH WARNING"
+        final = self._COMBINE[(z_dec["decision"], merton_dec["decision"])]
 
         return {
             "decision": final,
@@ -0,0 +1,162 @@
+"""
+Pruebas de FileCache: ida y vuelta, expiración por TTL, escritura atómica,
+entradas inválidas y límite de la capa en memoria.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from cache import FileCache, _ttl_days_from_env
+
+
+class FileCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.addCleanup(self._tmp.cleanup)
+
+    def test_round_trip(self):
+        FileCache(self.root).set(("AAA", "info"), {"longName": "Alpha", "marketCap": 3e11})
+        # Instancia nueva: la lectura viene del disco, no de la memoria
+        self.assertEqual(FileCache(self.root).get(("AAA", "info"), ttl=60),
+                         {"longName": "Alpha", "marketCap": 3e11})
+
+    def test_missing_key(self):
+        self.assertIsNone(FileCache(self.root).get(("AAA", "info"), ttl=60))
+
+    def test_expiry(self):
+        cache = FileCache(self.root)
+        with mock.patch("cache.time.time", return_value=1_000.0):
+            cache.set(("AAA", "info"), {"x": 1})
+        with mock.patch("cache.time.time", return_value=1_050.0):
+            self.assertEqual(cache.get(("AAA", "info"), ttl=60), {"x": 1})
+        with mock.patch("cache.time.time", return_value=1_061.0):
+            self.assertIsNone(cache.get(("AAA", "info"), ttl=60))
+            # Lo expirado también se descarta de la memoria
+            self.assertEqual(cache._memory, {})
+            self.assertIsNone(FileCache(self.root).get(("AAA", "info"), ttl=60))
+
+    def test_overwrite_refreshes_ts(self):
+        cache = FileCache(self.root)
+        with mock.patch("cache.time.time", return_value=1_000.0):
+            cache.set(("AAA", "zscore"), 1)
+        with mock.patch("cache.time.time", return_value=2_000.0):
+            cache.set(("AAA", "zscore"), 2)
+            self.assertEqual(FileCache(self.root).get(("AAA", "zscore"), ttl=60), 2)
+        self.assertEqual(len(os.listdir(os.path.join(self.root, "AAA"))), 1)
+
+    def test_atomic_write_leaves_no_tmp(self):
+        cache = FileCache(self.root)
+        cache.set(("AAA", "info"), {"x": 1})
+        path = cache._path(("AAA", "info"))
+        self.assertEqual(os.listdir(os.path.dirname(path)), [os.path.basename(path)])
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["payload"], {"x": 1})
+
+    def test_failed_write_keeps_previous_file(self):
+        cache = FileCache(self.root)
+        cache.set(("AAA", "info"), {"x": 1})
+        with mock.patch("cache.os.replace", side_effect=OSError("disco lleno")):
+            cache.set(("AAA", "info"), {"x": 2})
+        self.assertEqual(FileCache(self.root).get(("AAA", "info"), ttl=60), {"x": 1})
+
+    def test_corrupt_file_is_a_miss(self):
+        cache = FileCache(self.root)
+        path  = cache._path(("AAA", "info"))
+        os.makedirs(os.path.dirname(path))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("{no es json")
+        self.assertIsNone(cache.get(("AAA", "info"), ttl=60))
+
+    def test_unexpected_shape_is_a_miss(self):
+        cache = FileCache(self.root)
+        path  = cache._path(("AAA", "info"))
+        os.makedirs(os.path.dirname(path))
+        for content in ("null", "[]", '{"ts": "ayer", "payload": 1}', '{"payload": 1}'):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+            self.assertIsNone(cache.get(("AAA", "info"), ttl=60), content)
+
+    def test_unserializable_payload_is_skipped(self):
+        cache = FileCache(self.root)
+        cache.set(("AAA", "info"), {("no", "str"): 1})
+        self.assertIsNone(cache.get(("AAA", "info"), ttl=60))
+        self.assertEqual(os.listdir(self.root), [])
+
+    def test_memory_hit_matches_disk(self):
+        cache   = FileCache(self.root)
+        payload = {"n": 1, "when": mock.sentinel.when, "pair": (1, 2)}
+        cache.set(("AAA", "info"), payload)
+        self.assertEqual(cache.get(("AAA", "info"), ttl=60),
+                         FileCache(self.root).get(("AAA", "info"), ttl=60))
+
+    def test_ttl_env_fallback(self):
+        with mock.patch.dict(os.environ, {"STOCK_CACHE_TTL_DAYS": "2.5"}):
+            self.assertEqual(_ttl_days_from_env(), 2.5)
+        with mock.patch.dict(os.environ, {"STOCK_CACHE_TTL_DAYS": "un día"}):
+            self.assertEqual(_ttl_days_from_env(), 1.0)
+
+    def test_disabled(self):
+        cache = FileCache(self.root, enabled=False)
+        cache.set(("AAA", "info"), {"x": 1})
+        self.assertIsNone(cache.get(("AAA", "info"), ttl=60))
+        self.assertEqual(os.listdir(self.root), [])
+
+    def test_memory_is_bounded(self):
+        cache = FileCache(self.root, max_memory=3)
+        for i in range(5):
+            cache.set((f"T{i}", "info"), i)
+        self.assertEqual(len(cache._memory), 3)
+        self.assertNotIn(cache._path(("T0", "info")), cache._memory)
+        # Lo desalojado de memoria sigue disponible en disco
+        self.assertEqual(cache.get(("T0", "info"), ttl=60), 0)
+
+    def test_concurrent_access_keeps_memory_bounded(self):
+        cache   = FileCache(self.root, max_memory=8)
+        errors  = []
+        barrier = threading.Barrier(8)
+
+        def worker(n):
+            try:
+                barrier.wait()
+                for i in range(200):
+                    key = (f"T{(n * 7 + i) % 20}", "info")
+                    cache.set(key, i)
+                    cache.get(key, ttl=60)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(cache._memory), 8)
+
+    def test_ticker_cannot_escape_root(self):
+        cache = FileCache(self.root)
+        root  = os.path.realpath(self.root)
+        for ticker in ("../../tmp/x", "A/B", "..", ".", "", "C:\\x", "/etc/passwd"):
+            path = os.path.realpath(cache._path((ticker, "info")))
+            self.assertEqual(os.path.dirname(os.path.dirname(path)), root, ticker)
+        cache.set(("A/B", "info"), 1)
+        cache.set(("A_B", "info"), 2)
+        fresh = FileCache(self.root)
+        self.assertEqual(fresh.get(("A/B", "info"), ttl=60), 1)
+        self.assertEqual(fresh.get(("A_B", "info"), ttl=60), 2)
+
+    def test_plain_tickers_keep_their_folder(self):
+        cache = FileCache(self.root)
+        for ticker in ("AAPL", "BRK-B", "SAN.MC", "^TNX", "EURUSD=X"):
+            folder = os.path.basename(os.path.dirname(cache._path((ticker, "info"))))
+            self.assertEqual(folder, ticker)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Pruebas de la CDF normal y de los cálculos vectorizados de calculators.py.
+"""
+
+import math
+import unittest
+
+import numpy as np
+
+import calculators
+from calculators import MertonCalculator, ZScoreCalculator, _ndtr_erf
+
+
+def _cdf(x: float) -> float:
+    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+
+
+class NdtrFallbackTest(unittest.TestCase):
+    """_ndtr_erf es la CDF que se usa cuando SciPy no está instalado."""
+
+    def test_scalar(self):
+        self.assertAlmostEqual(float(_ndtr_erf(0.5)), _cdf(0.5), places=12)
+        self.assertAlmostEqual(float(_ndtr_erf(np.float64(-1.0))), _cdf(-1.0), places=12)
+
+    def test_array(self):
+        x   = np.array([-3.0, 0.0, 1.5])
+        out = _ndtr_erf(x)
+        self.assertEqual(out.dtype, np.float64)
+        self.assertEqual(out.shape, x.shape)
+        for xi, yi in zip(x, out):
+            self.assertAlmostEqual(yi, _cdf(xi), places=12)
+
+    def test_empty(self):
+        self.assertEqual(_ndtr_erf(np.array([])).shape, (0,))
+
+    def test_matches_scipy(self):
+        try:
+            from scipy.special import ndtr
+        except ImportError:
+            self.skipTest("scipy no instalado")
+        x = np.linspace(-6, 6, 25)
+        np.testing.assert_allclose(_ndtr_erf(x), ndtr(x), rtol=1e-12, atol=1e-15)
+
+
+class MertonBatchTest(unittest.TestCase):
+
+    def _scalar(self, V_A, D, mu, sigma, T=1.0):
+        r = MertonCalculator({"V_A": V_A, "D": D, "mu": mu, "sigma": sigma, "T": T}).calculate()
+        return r["DD"], r["PD"]
+
+    def _check(self, ndtr):
+        original, calculators.ndtr = calculators.ndtr, ndtr
+        try:
+            dd, pd_ = MertonCalculator.calculate_batch(100.0, 50.0, 0.05, 0.2)
+            exp_dd, exp_pd = self._scalar(100.0, 50.0, 0.05, 0.2)
+            self.assertAlmostEqual(float(dd), exp_dd, places=10)
+            self.assertAlmostEqual(float(pd_), exp_pd, places=10)
+
+            V_A, D, mu, sigma = [100.0, 200.0, 80.0], [50.0, 150.0, 79.0], [0.05, 0.01, -0.02], [0.2, 0.3, 0.1]
+            dd, pd_ = MertonCalculator.calculate_batch(V_A, D, mu, sigma)
+            self.assertEqual(dd.shape, (3,))
+            for i in range(3):
+                exp_dd, exp_pd = self._scalar(V_A[i], D[i], mu[i], sigma[i])
+                self.assertAlmostEqual(dd[i], exp_dd, places=10)
+                self.assertAlmostEqual(pd_[i], exp_pd, places=10)
+        finally:
+            calculators.ndtr = original
+
+    def test_without_scipy(self):
+        self._check(_ndtr_erf)
+
+    def test_with_scipy(self):
+        try:
+            from scipy.special import ndtr
+        except ImportError:
+            self.skipTest("scipy no instalado")
+        self._check(ndtr)
+
+    def test_rejects_non_positive(self):
+        with self.assertRaises(ValueError):
+            MertonCalculator.calculate_batch([100.0], [0.0], [0.05], [0.2])
+        with self.assertRaises(ValueError):
+            MertonCalculator.calculate_batch([100.0], [50.0], [0.05], [0.0])
+
+
+class ZScoreBatchTest(unittest.TestCase):
+
+    DATA = [
+        {"working_capital": -20e9, "total_assets": 360e9, "retained_earnings": -19e9,
+         "ebit": 120e9, "market_cap": 3e11, "total_liabilities": 300e9, "sales": 390e9},
+        {"working_capital": 0.0, "total_assets": 4e12, "retained_earnings": 3e11,
+         "ebit": 6e10, "market_cap": 5e11, "total_liabilities": 3.6e12, "sales": 1.6e11},
+        {"working_capital": 30e9, "total_assets": 500e9, "retained_earnings": 170e9,
+         "ebit": 100e9, "market_cap": 2e12, "total_liabilities": 250e9, "sales": 240e9},
+    ]
+    VERSIONS = ["Z", "Z_double_prime", "Z_double_prime"]
+
+    def test_coefficients_view(self):
+        self.assertEqual(ZScoreCalculator.COEFFICIENTS, {
+            "Z":              {"x1": 1.2,  "x2": 1.4,  "x3": 3.3,  "x4": 0.6,  "x5": 1.0},
+            "Z_double_prime": {"x1": 6.56, "x2": 3.26, "x3": 6.72, "x4": 1.05, "x5": 0.0},
+        })
+        for v in ZScoreCalculator.COEFFICIENTS.values():
+            self.assertTrue(all(type(c) is float for c in v.values()))
+
+    def test_matches_scalar(self):
+        batch = ZScoreCalculator.calculate_batch(self.DATA, self.VERSIONS)
+        self.assertEqual(len(batch), len(self.DATA))
+        for d, v, got in zip(self.DATA, self.VERSIONS, batch):
+            exp = ZScoreCalculator(d, v).calculate()
+            self.assertEqual(got["model_version"], v)
+            for k in ("x1", "x2", "x3", "x4", "x5", "z_score"):
+                self.assertAlmostEqual(got[k], exp[k], places=10, msg=k)
+
+    def test_single_row(self):
+        (got,) = ZScoreCalculator.calculate_batch(self.DATA[:1], ["Z"])
+        self.assertAlmostEqual(got["z_score"], ZScoreCalculator(self.DATA[0], "Z").calculate()["z_score"])
+
+    def test_double_prime_ignores_sales(self):
+        (got,) = ZScoreCalculator.calculate_batch(self.DATA[1:2], ["Z_double_prime"])
+        self.assertEqual(got["x5"], 0.0)
+
+    def test_empty(self):
+        self.assertEqual(ZScoreCalculator.calculate_batch([], []), [])
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            ZScoreCalculator.calculate_batch(self.DATA, ["Z"])
+        with self.assertRaises(ValueError):
+            ZScoreCalculator.calculate_batch(self.DATA[:1], ["bogus"])
+        with self.assertRaises(ZeroDivisionError):
+            ZScoreCalculator.calculate_batch([dict(self.DATA[0], total_liabilities=0.0)], ["Z"])
+
+
+if __name__ == "__main__":
+    unittest.main()
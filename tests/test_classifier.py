@@ -0,0 +1,48 @@
+"""
+Pruebas del CompanyClassifier con regex y, si está instalado, con Aho-Corasick.
+"""
+
+import unittest
+from unittest import mock
+
+import classifier
+from classifier import CompanyClassifier
+
+CASES = [
+    ("Auto Manufacturers",          "manufacturing",     "Z"),
+    ("Semiconductors",              "manufacturing",     "Z"),
+    ("Banks - Diversified",         "financial",         "Z_double_prime"),
+    ("Insurance - Life",            "financial",         "Z_double_prime"),
+    ("Software - Infrastructure",   "non_manufacturing", "Z_double_prime"),
+    ("",                            "non_manufacturing", "Z_double_prime"),
+    # Financiero tiene prioridad sobre manufactura
+    ("Auto Credit Financial",       "financial",         "Z_double_prime"),
+]
+
+
+class ClassifierTest(unittest.TestCase):
+
+    def _check_cases(self):
+        for industry, company_type, model in CASES:
+            with self.subTest(industry=industry):
+                c = CompanyClassifier(industry, total_liabilities=1.0)
+                self.assertEqual(c.classify(), company_type)
+                self.assertEqual(c.get_model_version(), model)
+
+    def test_regex(self):
+        with mock.patch.object(CompanyClassifier, "_AUTOMATON", None):
+            self._check_cases()
+
+    def test_automaton(self):
+        if classifier.ahocorasick is None:
+            self.skipTest("pyahocorasick no instalado")
+        self.assertIsNotNone(CompanyClassifier._AUTOMATON)
+        self._check_cases()
+
+    def test_merton_applicability(self):
+        self.assertTrue(CompanyClassifier("Software", total_liabilities=1.0).get_merton_applicability())
+        self.assertFalse(CompanyClassifier("Software", total_liabilities=0.0).get_merton_applicability())
+
+
+if __name__ == "__main__":
+    unittest.main()
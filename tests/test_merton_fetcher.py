@@ -0,0 +1,177 @@
+"""
+Pruebas de merton_fetcher: tasa ^TNX compartida entre hilos e historia de
+activos/pasivos para μ y σ.
+"""
+
+import math
+import threading
+import time
+import unittest
+import warnings
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import merton_fetcher
+from cache import FileCache
+from merton_fetcher import MertonDataFetcher
+
+
+class _FakeTNX:
+    """yf.Ticker("^TNX") que cuenta descargas y tarda un poco en responder."""
+
+    def __init__(self, price=4.25, fail=False):
+        self.calls = 0
+        self.price = price
+        self.fail  = fail
+        self._lock = threading.Lock()
+
+    def __call__(self, ticker):
+        return self
+
+    @property
+    def info(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.05)
+        if self.fail:
+            raise ConnectionError("sin red")
+        return {"regularMarketPrice": self.price}
+
+
+class TnxRateTest(unittest.TestCase):
+
+    def setUp(self):
+        merton_fetcher._TNX_RATES.clear()
+        self.addCleanup(merton_fetcher._TNX_RATES.clear)
+        # Caché en disco desactivada: cada miss llega a yfinance
+        patcher = mock.patch.object(merton_fetcher, "CACHE", FileCache(enabled=False))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _rates_from_threads(self, n=8):
+        rates   = [None] * n
+        barrier = threading.Barrier(n)
+
+        def worker(i):
+            barrier.wait()
+            rates[i] = merton_fetcher._get_tnx_rate(1)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return rates
+
+    def test_concurrent_misses_download_once(self):
+        fake = _FakeTNX()
+        with mock.patch.object(merton_fetcher.yf, "Ticker", fake):
+            rates = self._rates_from_threads()
+        self.assertEqual(fake.calls, 1)
+        self.assertEqual(rates, [0.0425] * len(rates))
+
+    def test_new_bucket_downloads_again(self):
+        fake = _FakeTNX()
+        with mock.patch.object(merton_fetcher.yf, "Ticker", fake):
+            merton_fetcher._get_tnx_rate(1)
+            merton_fetcher._get_tnx_rate(2)
+        self.assertEqual(fake.calls, 2)
+
+    def test_failure_is_not_cached(self):
+        fake = _FakeTNX(fail=True)
+        with mock.patch.object(merton_fetcher.yf, "Ticker", fake), warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            self.assertEqual(merton_fetcher._get_tnx_rate(1), 0.04)
+            fake.fail = False
+            self.assertEqual(merton_fetcher._get_tnx_rate(1), 0.0425)
+        self.assertEqual(fake.calls, 2)
+
+    def test_failure_warns(self):
+        fake = _FakeTNX(fail=True)
+        with mock.patch.object(merton_fetcher.yf, "Ticker", fake):
+            with self.assertWarns(UserWarning):
+                merton_fetcher._get_tnx_rate(1)
+
+
+def _balance_sheet(assets: dict, liabilities: dict) -> pd.DataFrame:
+    """Balance con el formato de yfinance: filas por concepto, años de más reciente a más antiguo."""
+    years = sorted(assets, reverse=True)
+    return pd.DataFrame(
+        [[assets[y] for y in years], [liabilities[y] for y in years]],
+        index=["Total Assets", "Total Liabilities Net Minority Interest"],
+        columns=[pd.Timestamp(f"{y}-12-31") for y in years],
+    )
+
+
+def _loop_mu_sigma(assets: list) -> tuple:
+    """Cálculo original de μ y σ, variación a variación."""
+    pct_changes = []
+    for i in range(1, len(assets)):
+        prev = assets[i - 1]
+        curr = assets[i]
+        if prev == 0:
+            continue
+        pct_changes.append((curr - prev) / abs(prev))
+    mu    = float(np.mean(pct_changes))
+    sigma = float(np.std(pct_changes, ddof=1)) if len(pct_changes) > 1 else abs(pct_changes[0])
+    return mu, sigma
+
+
+class HistoricalBalanceTest(unittest.TestCase):
+
+    ASSETS      = {2020: 100.0, 2021: 112.0, 2022: 130.0, 2023: 121.0, 2024: 140.0}
+    LIABILITIES = {2020: 60.0,  2021: 66.0,  2022: math.nan, 2023: 70.0, 2024: 75.0}
+
+    def setUp(self):
+        patcher = mock.patch.object(merton_fetcher, "CACHE", FileCache(enabled=False))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _fetch(self, assets, liabilities):
+        fetcher = MertonDataFetcher("TEST", yf_ticker=object())
+        stock   = SimpleNamespace(balance_sheet=_balance_sheet(assets, liabilities))
+        fetcher._fetch_historical_balance(stock)
+        return fetcher
+
+    def test_year_missing_liabilities_is_dropped_from_both(self):
+        fetcher = self._fetch(self.ASSETS, self.LIABILITIES)
+        kept    = [self.ASSETS[y] for y in (2020, 2021, 2023, 2024)]
+        self.assertEqual(fetcher.n_years_used, 4)
+        self.assertEqual(list(fetcher.assets_history), kept)
+        self.assertEqual(fetcher.V_A, 140.0)
+        self.assertEqual(fetcher.D, 75.0)
+
+        fetcher._calculate_mu_and_sigma()
+        mu, sigma = _loop_mu_sigma(kept)
+        self.assertAlmostEqual(fetcher.mu, mu, places=12)
+        self.assertAlmostEqual(fetcher.sigma, sigma, places=12)
+
+    def test_latest_year_missing_liabilities(self):
+        liabilities = {2020: 60.0, 2021: 66.0, 2022: 68.0, 2023: 70.0, 2024: math.nan}
+        fetcher     = self._fetch(self.ASSETS, liabilities)
+        # V_A y D salen del mismo año
+        self.assertEqual(fetcher.n_years_used, 4)
+        self.assertEqual(fetcher.V_A, 121.0)
+        self.assertEqual(fetcher.D, 70.0)
+
+    def test_zero_assets_year_matches_loop(self):
+        assets  = {2020: 0.0, 2021: 50.0, 2022: 80.0, 2023: 72.0}
+        liab    = {2020: 1.0, 2021: 30.0, 2022: 40.0, 2023: 41.0}
+        fetcher = self._fetch(assets, liab)
+        fetcher._calculate_mu_and_sigma()
+        mu, sigma = _loop_mu_sigma([assets[y] for y in sorted(assets)])
+        self.assertAlmostEqual(fetcher.mu, mu, places=12)
+        self.assertAlmostEqual(fetcher.sigma, sigma, places=12)
+
+    def test_too_few_complete_years(self):
+        assets = {2023: 100.0, 2024: 110.0}
+        liab   = {2023: math.nan, 2024: 60.0}
+        with self.assertRaises(ValueError):
+            self._fetch(assets, liab)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Pruebas de la combinación de decisiones de RiskAnalyzer.
+"""
+
+import contextlib
+import io
+import itertools
+import logging
+import threading
+import unittest
+from unittest import mock
+
+from decisions     import BaseCreditDecision
+from risk_analyzer import RiskAnalyzer
+
+DECISIONS = (
+    BaseCreditDecision.APPROVED,
+    BaseCreditDecision.APPROVED_WARNING,
+    BaseCreditDecision.DENIED,
+)
+
+
+def _baseline_combine(z: str, m: str) -> str:
+    """Regla original basada en conjuntos, como referencia."""
+    decisions = {z, m}
+    if "DENIED" in decisions:
+        return "DENIED"
+    if decisions == {"APPROVED"}:
+        return "APPROVED"
+    return "APPROVED WITH WARNING"
+
+
+class CombineDecisionsTest(unittest.TestCase):
+
+    def test_table_covers_all_pairs(self):
+        self.assertEqual(set(RiskAnalyzer._COMBINE), set(itertools.product(DECISIONS, repeat=2)))
+
+    def test_table_matches_baseline(self):
+        for z, m in itertools.product(DECISIONS, repeat=2):
+            with self.subTest(z=z, m=m):
+                self.assertEqual(RiskAnalyzer._COMBINE[(z, m)], _baseline_combine(z, m))
+
+    def setUp(self):
+        # Sin __init__: combinar decisiones no necesita estado del análisis
+        self.analyzer = RiskAnalyzer.__new__(RiskAnalyzer)
+
+    def test_combine_decisions(self):
+        res = self.analyzer._combine_decisions({"decision": "APPROVED"}, {"decision": "DENIED"})
+        self.assertEqual(res["decision"], "DENIED")
+        self.assertEqual(res["basis"], "Z-Score: APPROVED | Merton: DENIED")
+
+    def test_without_merton(self):
+        res = self.analyzer._combine_decisions({"decision": "APPROVED WITH WARNING"}, None)
+        self.assertEqual(res["decision"], "APPROVED WITH WARNING")
+        self.assertIn("Merton no aplicable", res["basis"])
+
+
+class ProgressBufferTest(unittest.TestCase):
+
+    def _analyzer(self, ticker):
+        a = RiskAnalyzer.__new__(RiskAnalyzer)
+        a.ticker, a._lines = ticker, []
+        return a
+
+    def test_logs_inside_phase_go_to_buffer(self):
+        log = logging.getLogger("zscore_fetcher")
+        a   = self._analyzer("AAA")
+
+        def step():
+            a._say("paso")
+            log.warning("  [AVISO] dentro de la fase")
+
+        a._in_phase(step)
+        self.assertEqual(a._lines, ["paso", "  [AVISO] dentro de la fase"])
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            a.flush_progress()
+        self.assertEqual(out.getvalue(), "paso\n  [AVISO] dentro de la fase\n")
+        self.assertEqual(a._lines, [])
+
+    def test_threads_keep_separate_buffers(self):
+        log = logging.getLogger("zscore_fetcher")
+        analyzers = [self._analyzer(t) for t in ("AAA", "BBB", "CCC")]
+        barrier   = threading.Barrier(len(analyzers))
+
+        def step(a):
+            barrier.wait()
+            for k in range(50):
+                a._say(f"{a.ticker} {k}")
+                log.warning("%s aviso %d", a.ticker, k)
+
+        threads = [threading.Thread(target=a._in_phase, args=(step, a)) for a in analyzers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for a in analyzers:
+            self.assertEqual(len(a._lines), 100)
+            self.assertTrue(all(line.startswith(a.ticker) for line in a._lines))
+
+    def test_guard_records_error_in_buffer(self):
+        a = self._analyzer("ZZZ")
+
+        def boom():
+            raise ValueError("sin datos")
+
+        res = RiskAnalyzer._guard(a, boom)
+        self.assertEqual(res, {"ticker": "ZZZ", "error": "sin datos"})
+        self.assertIn("ZZZ", a._lines[-1])
+
+
+class AnalyzeMultipleTest(unittest.TestCase):
+
+    def test_ticker_constructor_error_is_per_ticker(self):
+        # yf.Ticker puede fallar al construirse (ISIN inválido): solo ese ticker da error
+        def ticker(symbol):
+            raise ValueError(f"Invalid ISIN number: {symbol}")
+
+        with mock.patch("risk_analyzer.yf.Ticker", side_effect=ticker), \
+             contextlib.redirect_stdout(io.StringIO()):
+            res = RiskAnalyzer.analyze_multiple(["AAA", "BBB"], max_workers=1)
+
+        self.assertEqual([r["ticker"] for r in res], ["AAA", "BBB"])
+        self.assertTrue(all("Invalid ISIN" in r["error"] for r in res))
+
+    def test_keeps_yfinance_session_open(self):
+        # yfinance usa una sola sesión por proceso: el análisis no debe
+        # reemplazarla ni cerrarla para el resto de hilos y llamadas
+        from yfinance.data import YfData
+
+        session = YfData()._session
+        with mock.patch("risk_analyzer.ZScoreDataFetcher.fetch_all", side_effect=ValueError("sin red")), \
+             contextlib.redirect_stdout(io.StringIO()):
+            res = RiskAnalyzer.analyze_multiple(["AAA", "BBB"])
+
+        self.assertTrue(all("error" in r for r in res))
+        self.assertIs(YfData()._session, session)
+        self.assertFalse(session._closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
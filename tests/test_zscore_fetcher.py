@@ -0,0 +1,142 @@
+"""
+Pruebas de la búsqueda de filas de los estados financieros en zscore_fetcher.
+"""
+
+import logging
+import math
+import tempfile
+import unittest
+from unittest import mock
+
+import zscore_fetcher
+from cache          import FileCache
+from zscore_fetcher import EBIT_KEYS, SALES_KEYS, ZScoreDataFetcher, _first_present
+
+
+class FirstPresentTest(unittest.TestCase):
+
+    def test_first_key_wins(self):
+        latest = {"EBIT": 10, "Operating Income": 20, "Pretax Income": 30}
+        self.assertEqual(_first_present(latest, EBIT_KEYS), ("EBIT", 10.0))
+
+    def test_falls_through_missing_and_nan(self):
+        latest = {"EBIT": math.nan, "Pretax Income": 30}
+        self.assertEqual(_first_present(latest, EBIT_KEYS), ("Pretax Income", 30.0))
+        latest = {"Total Revenue": None, "Operating Revenue": 5}
+        self.assertEqual(_first_present(latest, SALES_KEYS), ("Operating Revenue", 5.0))
+
+    def test_none_present(self):
+        self.assertEqual(_first_present({"EBIT": math.nan}, EBIT_KEYS), (None, None))
+        self.assertEqual(_first_present({}, SALES_KEYS), (None, None))
+
+    def test_zero_is_a_value(self):
+        self.assertEqual(_first_present({"EBIT": 0}, EBIT_KEYS), ("EBIT", 0.0))
+
+    def test_returns_float(self):
+        _, value = _first_present({"Total Revenue": 7}, SALES_KEYS)
+        self.assertIs(type(value), float)
+
+
+class _FakeStatements:
+    """Estados por frecuencia; registra cada pedido como (estado, freq)."""
+
+    def __init__(self, balance, income):
+        self._data = {"balance_sheet": balance, "income_stmt": income}
+        self.calls = []
+
+    def _get(self, statement, freq):
+        self.calls.append((statement, freq))
+        return self._data[statement].get(freq, {})
+
+    def get_balance_sheet(self, as_dict=False, pretty=False, freq="yearly"):
+        return self._get("balance_sheet", freq)
+
+    def get_income_stmt(self, as_dict=False, pretty=False, freq="yearly"):
+        return self._get("income_stmt", freq)
+
+
+class LatestPeriodDictTest(unittest.TestCase):
+
+    def setUp(self):
+        self.fetcher = ZScoreDataFetcher("TEST", yf_ticker=object())
+
+    def test_annual_no_fallback(self):
+        stock = _FakeStatements({"yearly": {"2024": {"Total Assets": 1}}},
+                                {"yearly": {"2024": {"EBIT": 2}}})
+        with self.assertNoLogs("zscore_fetcher"):
+            self.assertEqual(self.fetcher._latest_period_dict(stock, "balance_sheet"), {"Total Assets": 1})
+            self.assertEqual(self.fetcher._latest_period_dict(stock, "income_stmt"), {"EBIT": 2})
+        self.assertEqual(stock.calls, [("balance_sheet", "yearly"), ("income_stmt", "yearly")])
+
+    def test_balance_falls_back_to_quarterly(self):
+        stock = _FakeStatements({"quarterly": {"2025Q2": {"Total Assets": 3}}}, {})
+        with self.assertLogs("zscore_fetcher", "WARNING") as cm:
+            self.assertEqual(self.fetcher._latest_period_dict(stock, "balance_sheet"), {"Total Assets": 3})
+        self.assertEqual(stock.calls, [("balance_sheet", "yearly"), ("balance_sheet", "quarterly")])
+        self.assertIn("TEST", cm.output[0])
+
+    def test_income_falls_back_to_trailing(self):
+        stock = _FakeStatements({}, {"quarterly": {"2025Q2": {"EBIT": 1}},
+                                     "trailing":  {"2025Q2": {"EBIT": 4}}})
+        with self.assertLogs("zscore_fetcher", "WARNING"):
+            self.assertEqual(self.fetcher._latest_period_dict(stock, "income_stmt"), {"EBIT": 4})
+        self.assertEqual(stock.calls, [("income_stmt", "yearly"), ("income_stmt", "trailing")])
+
+    def test_nothing_available(self):
+        stock = _FakeStatements({}, {})
+        with self.assertNoLogs("zscore_fetcher"):
+            self.assertEqual(self.fetcher._latest_period_dict(stock, "income_stmt"), {})
+
+
+class CachedNoticesTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+
+    @staticmethod
+    def _stock():
+        # Working Capital desde CA-CL, sin Retained Earnings, EBIT desde Pretax
+        # Income y balance solo trimestral: todos los avisos de calidad de datos
+        stock = _FakeStatements(
+            {"quarterly": {"2024Q4": {"Total Assets": 5_000_000,
+                                      "Total Liabilities Net Minority Interest": 40,
+                                      "Current Assets": 1_500_000,
+                                      "Current Liabilities": 300_000}}},
+            {"yearly": {"2024": {"Pretax Income": 10, "Total Revenue": 50}}},
+        )
+        stock.info = {"longName": "Test Corp", "industry": "Banks", "marketCap": 200}
+        return stock
+
+    def _fetch(self):
+        stock = self._stock()
+        # Instancia nueva cada vez: el hit viene del disco, como en otra ejecución
+        with mock.patch.object(zscore_fetcher, "CACHE", FileCache(self.root)), \
+             self.assertLogs("zscore_fetcher", "INFO") as cm:
+            data = ZScoreDataFetcher("TEST", yf_ticker=stock).fetch_all()
+        return data, cm.output, stock.calls
+
+    def test_cache_hit_replays_notices(self):
+        cold_data, cold_logs, cold_calls = self._fetch()
+        warm_data, warm_logs, warm_calls = self._fetch()
+        self.assertTrue(cold_calls)
+        self.assertEqual(warm_calls, [])
+        self.assertEqual(warm_data, cold_data)
+        self.assertEqual(warm_logs, cold_logs)
+        self.assertEqual(len(cold_logs), 4)
+        self.assertIn("1,200,000", cold_logs[1])
+
+    def test_disabled_level_is_not_formatted(self):
+        logger = zscore_fetcher.log
+        self.addCleanup(logger.setLevel, logger.level)
+        logger.setLevel(logging.WARNING)
+        with mock.patch.object(zscore_fetcher, "CACHE", FileCache(enabled=False)), \
+             mock.patch.object(zscore_fetcher._Thousands, "__str__") as fmt, \
+             self.assertLogs("zscore_fetcher", "WARNING"):
+            ZScoreDataFetcher("TEST", yf_ticker=self._stock()).fetch_all()
+        fmt.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
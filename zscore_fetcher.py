@@ -5,8 +5,55 @@ Descarga datos financieros para el modelo Altman Z-Score.
 Maneja campos faltantes en sectores financieros (bancos, aseguradoras).
 """
 
-import yfinance as yf
+import logging
+
 from base_fetcher import BaseDataFetcher
+from cache        import CACHE, DEFAULT_TTL
+
+log = logging.getLogger(__name__)
+
+# Filas candidatas de cada campo, en orden de preferencia
+TOTAL_ASSETS_KEYS      = ("Total Assets",)
+TOTAL_LIAB_KEYS        = ("Total Liabilities Net Minority Interest",)
+WORKING_CAPITAL_KEYS   = ("Working Capital",)
+RETAINED_EARNINGS_KEYS = ("Retained Earnings",)
+EBIT_KEYS              = ("EBIT", "Operating Income", "Pretax Income")
+SALES_KEYS             = ("Total Revenue", "Operating Revenue")
+
+# Mensaje a emitir cuando gana una fila alternativa
+FALLBACK_NOTES = {
+    "Operating Income":  (logging.INFO,    "  [INFO] EBIT aproximado con Operating Income."),
+    "Pretax Income":     (logging.WARNING, "  [AVISO] EBIT no disponible. Usando Pretax Income como aproximación."),
+    "Operating Revenue": (logging.INFO,    "  [INFO] Sales tomado de Operating Revenue."),
+}
+
+# Frecuencia alternativa si el estado anual viene vacío: el balance es una
+# foto y admite el último trimestre; la cuenta de resultados necesita 12 meses
+STATEMENT_FALLBACK = {
+    "balance_sheet": ("quarterly", "del último trimestre"),
+    "income_stmt":   ("trailing",  "TTM (últimos 12 meses)"),
+}
+
+
+class _Thousands:
+    """Número con separador de miles; se formatea solo si el aviso se emite."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: float):
+        self.value = value
+
+    def __str__(self) -> str:
+        return f"{self.value:,.0f}"
+
+
+def _first_present(latest: dict, keys: tuple) -> tuple:
+    """(fila, valor) de la primera fila de keys con dato (no None ni NaN); (None, None) si no hay."""
+    for key in keys:
+        value = latest.get(key)
+        if value is not None and value == value:
+            return key, float(value)
+    return None, None
 
 
 class ZScoreDataFetcher(BaseDataFetcher):
@@ -15,8 +62,8 @@ class ZScoreDataFetcher(BaseDataFetcher):
         "total_assets", "ebit", "market_cap", "total_liabilities", "sales",
     ]
 
-    def __init__(self, ticker: str):
-        super().__init__(ticker)
+    def __init__(self, ticker: str, yf_ticker=None):
+        super().__init__(ticker, yf_ticker)
         self.industry          = ""
         self.working_capital   = 0.0
         self.total_assets      = None
@@ -25,13 +72,33 @@ class ZScoreDataFetcher(BaseDataFetcher):
         self.market_cap        = None
         self.total_liabilities = None
         self.sales             = None
+        self._latest           = {}
+        self._notes            = []   # (nivel, formato, args) de los avisos emitidos
 
     def fetch_all(self) -> dict:
-        stock = yf.Ticker(self.ticker)
-        self._fetch_company_info(stock)
-        self._fetch_balance_sheet(stock)
-        self._fetch_income_statement(stock)
-        self._fetch_market_data(stock)
+        # Una entrada por ticker, renovada al expirar el TTL
+        key    = (self.ticker, "zscore")
+        cached = CACHE.get(key, ttl=DEFAULT_TTL)
+        if cached is not None:
+            self.company_name = cached["company_name"]
+            self.industry     = cached["industry"]
+            for field, value in cached["data"].items():
+                setattr(self, field, value)
+            # Los avisos de calidad de datos afectan la lectura del Z-Score:
+            # se repiten igual que en la descarga original
+            for level, fmt, args in cached.get("notes", ()):
+                self._note(level, fmt, *args)
+            return dict(cached["data"])
+
+        # Cada paso aborta en cuanto falta un campo obligatorio, así un ticker
+        # sin estados financieros no llega a pedir los siguientes endpoints
+        stock = self._stock
+        self._fetch_balance_sheet(stock)       # Total Assets / Total Liabilities
+        self._check_total_assets()
+        self._fetch_income_statement(stock)    # EBIT / Sales
+        info = stock.info   # yf.Ticker cachea info: el fetcher de Merton lo reutiliza
+        self._fetch_company_info(info)
+        self._fetch_market_data(info)          # Market Cap
 
         data = {
             "working_capital":   self.working_capital,
@@ -43,66 +110,112 @@ class ZScoreDataFetcher(BaseDataFetcher):
             "sales":             self.sales,
         }
         self._validate_data(data, self.REQUIRED_FIELDS)
-        return data
-
-    def _fetch_company_info(self, stock):
-        info = stock.info
+        CACHE.set(key, {
+            "company_name": self.company_name,
+            "industry":     self.industry,
+            "data":         data,
+            "notes":        self._notes,
+        })
+        return dict(data)
+
+    def _fetch_company_info(self, info: dict):
         self.company_name = info.get("longName", self.ticker)
         self.industry     = info.get("industry", "")
 
     def _fetch_balance_sheet(self, stock):
-        bs = stock.balance_sheet
-        if bs is None or bs.empty:
+        latest = self._latest_period_dict(stock, "balance_sheet")
+        if not latest:
             raise ValueError(f"[{self.ticker}] No se encontró balance sheet.")
-        latest = bs.iloc[:, 0]
 
-        self.total_assets      = float(latest["Total Assets"])
-        self.total_liabilities = float(latest["Total Liabilities Net Minority Interest"])
+        self.total_assets      = self._require(latest, TOTAL_ASSETS_KEYS)
+        self.total_liabilities = self._require(latest, TOTAL_LIAB_KEYS)
 
         # Working Capital — no existe en bancos
-        if "Working Capital" in latest.index:
-            self.working_capital = float(latest["Working Capital"])
-        elif "Current Assets" in latest.index and "Current Liabilities" in latest.index:
-            self.working_capital = float(latest["Current Assets"]) - float(latest["Current Liabilities"])
-            print(f"  [INFO] Working Capital aproximado (CA-CL): {self.working_capital:,.0f}")
+        _, wc = _first_present(latest, WORKING_CAPITAL_KEYS)
+        _, ca = _first_present(latest, ("Current Assets",))
+        _, cl = _first_present(latest, ("Current Liabilities",))
+        if wc is not None:
+            self.working_capital = wc
+        elif ca is not None and cl is not None:
+            self.working_capital = ca - cl
+            self._note(logging.INFO, "  [INFO] Working Capital aproximado (CA-CL): %s",
+                       _Thousands(self.working_capital))
         else:
             self.working_capital = 0.0
-            print(f"  [AVISO] Working Capital no disponible para {self.ticker}. Usando 0.")
+            self._note(logging.WARNING, "  [AVISO] Working Capital no disponible para %s. Usando 0.", self.ticker)
 
         # Retained Earnings — puede no existir en algunos sectores
-        if "Retained Earnings" in latest.index:
-            self.retained_earnings = float(latest["Retained Earnings"])
+        _, re_ = _first_present(latest, RETAINED_EARNINGS_KEYS)
+        if re_ is not None:
+            self.retained_earnings = re_
         else:
             self.retained_earnings = 0.0
-            print(f"  [AVISO] Retained Earnings no disponible para {self.ticker}. Usando 0.")
+            self._note(logging.WARNING, "  [AVISO] Retained Earnings no disponible para %s. Usando 0.", self.ticker)
 
     def _fetch_income_statement(self, stock):
-        inc = stock.income_stmt
-        if inc is None or inc.empty:
+        latest = self._latest_period_dict(stock, "income_stmt")
+        if not latest:
             raise ValueError(f"[{self.ticker}] No se encontró income statement.")
-        latest = inc.iloc[:, 0]
 
         # EBIT — bancos no lo reportan, se usa Pretax Income como aproximación
-        if "EBIT" in latest.index:
-            self.ebit = float(latest["EBIT"])
-        elif "Operating Income" in latest.index:
-            self.ebit = float(latest["Operating Income"])
-            print(f"  [INFO] EBIT aproximado con Operating Income.")
-        elif "Pretax Income" in latest.index:
-            self.ebit = float(latest["Pretax Income"])
-            print(f"  [AVISO] EBIT no disponible. Usando Pretax Income como aproximación.")
-        else:
+        key, self.ebit = _first_present(latest, EBIT_KEYS)
+        if key is None:
             raise ValueError(f"[{self.ticker}] No se encontró EBIT ni alternativa válida.")
+        if key in FALLBACK_NOTES:
+            self._note(*FALLBACK_NOTES[key])
 
         # Sales
-        if "Total Revenue" in latest.index:
-            self.sales = float(latest["Total Revenue"])
-        elif "Operating Revenue" in latest.index:
-            self.sales = float(latest["Operating Revenue"])
-            print(f"  [INFO] Sales tomado de Operating Revenue.")
-        else:
+        key, self.sales = _first_present(latest, SALES_KEYS)
+        if key is None:
             raise ValueError(f"[{self.ticker}] No se encontró Total Revenue.")
-
-    def _fetch_market_data(self, stock):
-        info = stock.info
-        self.market_cap = float(info.get("marketCap"))
\ No newline at end of file
+        if key in FALLBACK_NOTES:
+            self._note(*FALLBACK_NOTES[key])
+
+    def _latest_period_dict(self, stock, statement: str) -> dict:
+        """
+        {fila: valor} del periodo más reciente de statement ("balance_sheet"
+        o "income_stmt"). yfinance arma igual el DataFrame completo; as_dict
+        solo nos ahorra el acceso celda a celda. Si el anual viene vacío se
+        usa la frecuencia de STATEMENT_FALLBACK y se avisa.
+        """
+        if statement not in self._latest:
+            getter  = getattr(stock, f"get_{statement}")
+            periods = getter(as_dict=True, pretty=True)
+            if not periods:
+                freq, label = STATEMENT_FALLBACK[statement]
+                periods     = getter(as_dict=True, pretty=True, freq=freq)
+                if periods:
+                    self._note(logging.WARNING, "  [AVISO] %s anual no disponible para %s. Usando datos %s.",
+                               statement, self.ticker, label)
+            # Las columnas vienen de más reciente a más antigua
+            self._latest[statement] = next(iter(periods.values()), {}) if periods else {}
+        return self._latest[statement]
+
+    def _note(self, level: int, fmt: str, *args) -> None:
+        """
+        Emite un aviso y lo anota para guardarlo junto a los datos en caché.
+        Formato %-style: con el nivel deshabilitado (--quiet) no se formatea.
+        """
+        self._notes.append((level, fmt, args))
+        log.log(level, fmt, *args)
+
+    def _require(self, latest: dict, keys: tuple) -> float:
+        key, value = _first_present(latest, keys)
+        if key is None:
+            raise ValueError(f"[{self.ticker}] No se encontró {keys[0]}.")
+        return value
+
+    def _fetch_market_data(self, info: dict):
+        market_cap = info.get("marketCap")
+        if market_cap is None:
+            raise ValueError(f"[{self.ticker}] No se encontró Market Cap.")
+        self.market_cap = float(market_cap)
+
+    def _check_total_assets(self):
+        # Total Assets es denominador de X1, X2, X3 y X5: sin activos no hay
+        # Z-Score. TL == 0 sí se deja pasar; el clasificador marca Merton como
+        # no aplicable para empresas sin pasivos.
+        if self.total_assets <= 0:
+            raise ValueError(
+                f"[{self.ticker}] Total Assets no positivo ({self.total_assets:,.0f})."
+            )
\ No newline at end of file